@@ -8,18 +8,24 @@ Výstupy: <basename>_anon.docx / _map.json / _map.txt
 """
 
 import sys, re, json, unicodedata
-from typing import Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from pathlib import Path
 from collections import defaultdict, OrderedDict
+from functools import lru_cache
 from docx import Document
 from datetime import datetime
 
+try:
+    import re2  # volitelné (google-re2): lineární regex engine bez backtrackingu
+except ImportError:
+    re2 = None
+
 # =============== Globální proměnné ===============
-CZECH_FIRST_NAMES = set()
+CZECH_FIRST_NAMES = frozenset()  # knihovna křestních jmen (lowercase), nastaví load_names_library
 
 # =============== Načítání knihovny jmen ===============
-def load_names_library(json_path: str = "cz_names.v1.json") -> Set[str]:
-    """Načte česká jména z JSON souboru."""
+def load_names_library(json_path: str = "cz_names.v1.json") -> FrozenSet[str]:
+    """Načte česká jména z JSON souboru (neměnná množina pro rychlé dotazy `in`)."""
     try:
         script_dir = Path(__file__).parent if '__file__' in globals() else Path.cwd()
         json_file = script_dir / json_path
@@ -29,7 +35,7 @@ def load_names_library(json_path: str = "cz_names.v1.json") -> Set[str]:
 
         if not json_file.exists():
             print(f"⚠️  Varování: {json_path} nenalezen, používám prázdnou knihovnu!")
-            return set()
+            return frozenset()
 
         with open(json_file, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -49,94 +55,64 @@ def load_names_library(json_path: str = "cz_names.v1.json") -> Set[str]:
             elif isinstance(data, list):
                 names.update(data)
 
-            # Převod na lowercase pro jednodušší porovnávání
-            names = {name.lower() for name in names}
+            # Převod na lowercase pro jednodušší porovnávání; lowercase křestní jména
+            # se internují – stejné tvary sdílí jeden objekt s hotovým hashem
+            names = frozenset(sys.intern(name.lower()) for name in names)
             print(f"✓ Načteno {len(names)} jmen z knihovny")
             return names
     except Exception as e:
         print(f"⚠️  Chyba při načítání {json_path}: {e}")
-        return set()
-
-# =============== Varianty pro nahrazování ===============
-def variants_for_first(first: str) -> set:
-    """Generuje základní pádové varianty křestního jména (optimalizováno pro výkon)."""
-    f = first.strip()
-    if not f: return {''}
-
-    V = {f, f.lower(), f.capitalize()}
-    low = f.lower()
-
-    # Ženská jména na -a
-    if low.endswith('a'):
-        stem = f[:-1]
-        # 7 pádů: nominativ, genitiv, dativ, akuzativ, vokativ, lokál, instrumentál
-        V |= {stem+'y', stem+'e', stem+'ě', stem+'u', stem+'ou', stem+'o'}
-    else:
-        # Mužská jména
-        V |= {f+'a', f+'ovi', f+'e', f+'em', f+'u', f+'om'}
-        # Speciální případy
-        if low.endswith('ek'): V.add(f[:-2] + 'ka')
-        if low.endswith('el'): V.add(f[:-2] + 'la')
-        if low.endswith('ec'): V.add(f[:-2] + 'ce')
-
-    # Bez diakritiky
-    V |= {unicodedata.normalize('NFKD', v).encode('ascii','ignore').decode('ascii') for v in list(V)}
-    return V
-
-def variants_for_surname(surname: str) -> set:
-    """Generuje základní pádové varianty příjmení (optimalizováno pro výkon)."""
-    s = surname.strip()
-    if not s: return {''}
-
-    out = {s, s.lower(), s.capitalize()}
-    low = s.lower()
-
-    # Ženská příjmení na -ová
-    if low.endswith('ová'):
-        base = s[:-1]
-        out |= {s, base+'é', base+'ou'}
-        return out
-
-    # Přídavná jména -ský, -cký, -ý
-    if low.endswith(('ský','cký','ý')):
-        if low.endswith(('ský','cký')):
-            stem = s[:-2]
-        else:
-            stem = s[:-1]
-        out |= {stem+'ý', stem+'ého', stem+'ému', stem+'ým', stem+'ém'}
-        out |= {stem+'á', stem+'é', stem+'ou'}
-        return out
-
-    # Ženská na -á
-    if low.endswith('á'):
-        stem = s[:-1]
-        out |= {s, stem+'é', stem+'ou'}
-        return out
-
-    # Speciální případy
-    if low.endswith('ek') and len(s) >= 3:
-        stem_k = s[:-2] + 'k'
-        out |= {s, stem_k+'a', stem_k+'ovi', stem_k+'em', stem_k+'u', stem_k+'e'}
-        return out
-
-    if low.endswith('el') and len(s) >= 3:
-        stem_l = s[:-2] + 'l'
-        out |= {s, stem_l+'a', stem_l+'ovi', stem_l+'em', stem_l+'u'}
-        return out
-
-    if low.endswith('ec') and len(s) >= 3:
-        stem_c = s[:-2] + 'c'
-        out |= {s, stem_c+'e', stem_c+'i', stem_c+'em', stem_c+'u'}
-        return out
-
-    # Standardní mužská příjmení
-    out |= {s+'a', s+'ovi', s+'e', s+'em', s+'u', s+'ům', s+'em'}
-    # Množné číslo: u Nováků
-    out |= {s+'ů', s+'ům'}
-
-    return out
+        return frozenset()
 
 # =============== Inference funkcí ===============
+# Běžná ženská jména, která se NIKDY nepřevádí na mužská
+# (knihovna jmen je neúplná - chybí např. Martina)
+_COMMON_FEMININE_NAMES = frozenset({
+    'martina', 'jana', 'petra', 'eva', 'anna', 'marie', 'lenka', 'kateřina',
+    'alena', 'hana', 'lucie', 'veronika', 'monika', 'jitka', 'zuzana', 'ivana',
+    'tereza', 'barbora', 'andrea', 'michaela', 'simona', 'nikola', 'pavla',
+    'daniela', 'alexandra', 'kristýna', 'markéta', 'renata', 'šárka', 'karolína'
+})
+
+# Skutečná mužská jména končící na -a (Kuba, Honza) - NEodstraňovat -a
+_MALE_NAMES_WITH_A = frozenset({'kuba', 'míla', 'nikola', 'saša', 'jirka', 'honza'})
+
+# Skokové tabulky podle posledního znaku: znak → ((koncovka, len(obs) musí být
+# větší než, náhrada), ...) v pořadí priority. Slovo tak prochází jen pravidla
+# pro svůj poslední znak místo celé řady str.endswith().
+
+# Mužská jména: -ka → -ek, -la → -el, -ce → -ec, -ovi/-em/-u/-a → odstranit
+# DŮLEŽITÉ: -u se testuje PŘED -a (Petra → Petr, ne Petro) - viz pořadí ve skupině 'a'
+_MALE_CASE_RULES = {
+    'a': (('ka', 2, 'ek'), ('la', 2, 'el'), ('a', 1, '')),
+    'e': (('ce', 2, 'ec'),),
+    'i': (('ovi', 3, ''),),
+    'm': (('em', 2, ''),),
+    'u': (('u', 1, ''),),
+}
+
+# Ženská jména - speciální vzory: ice → ika (Anice → Anika), ře → ra (Barbaře → Barbara)
+_FIRST_NAME_SOFT_RULES = {
+    'e': (('ice', 3, 'ika'), ('ře', 2, 'ra')),
+}
+
+# Ženská jména - pádové varianty: -y/-ě/-e → -a, -u → -a (Hanu), -ou → -a (Hanou)
+_FIRST_NAME_CASE_RULES = {
+    'y': (('y', 0, 'a'),),
+    'ě': (('ě', 0, 'a'),),
+    'e': (('e', 0, 'a'),),
+    'u': (('u', 1, 'a'), ('ou', 2, 'a')),
+}
+
+def _first_name_by_rules(obs: str, lo: str, rules: dict) -> Optional[str]:
+    """Zkusí pravidla pro poslední znak; vrátí první kandidát nalezený v knihovně jmen."""
+    for suffix, min_len, repl in rules.get(lo[-1:], ()):
+        if len(obs) > min_len and lo.endswith(suffix):
+            cut = len(suffix)
+            if lo[:-cut] + repl in CZECH_FIRST_NAMES:
+                return (obs[:-cut] + repl).capitalize()
+    return None
+
 def _male_genitive_to_nominative(obs: str) -> Optional[str]:
     """Převede pozorovaný tvar (např. genitiv) na nominativ pro mužská jména.
 
@@ -146,74 +122,28 @@ def _male_genitive_to_nominative(obs: str) -> Optional[str]:
     lo = obs.lower()
 
     # FIRST: Hardcoded list of common feminine names that should NEVER be converted
-    # This is necessary because the name library is incomplete (missing Martina, etc.)
-    common_feminine_names = {
-        'martina', 'jana', 'petra', 'eva', 'anna', 'marie', 'lenka', 'kateřina',
-        'alena', 'hana', 'lucie', 'veronika', 'monika', 'jitka', 'zuzana', 'ivana',
-        'tereza', 'barbora', 'andrea', 'michaela', 'simona', 'nikola', 'pavla',
-        'daniela', 'alexandra', 'kristýna', 'markéta', 'renata', 'šárka', 'karolína'
-    }
-
-    if lo in common_feminine_names:
+    if lo in _COMMON_FEMININE_NAMES:
         return None  # Don't convert feminine names to masculine
 
     # Also check library if available
     if lo in CZECH_FIRST_NAMES and lo.endswith('a'):
         return None  # Don't convert, let the caller handle it
 
-    cands = []
-
-    # PRIORITA 1: Speciální případy -ka → -ek, -la → -el, -ce → -ec
-    if lo.endswith('ka') and len(obs) > 2:
-        cand = obs[:-2] + 'ek'
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    if lo.endswith('la') and len(obs) > 2:
-        cand = obs[:-2] + 'el'
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    if lo.endswith('ce') and len(obs) > 2:
-        cand = obs[:-2] + 'ec'
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    # PRIORITA 2: Dativ -ovi → remove (Petrovi → Petr)
-    if lo.endswith('ovi') and len(obs) > 3:
-        cand = obs[:-3]
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    # PRIORITA 3: Instrumentál -em → remove (Petrem → Petr)
-    if lo.endswith('em') and len(obs) > 2:
-        cand = obs[:-2]
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    # PRIORITA 4: Dativ -u → remove (Petru → Petr) - PŘED -a!
-    # Důležité: testovat PŘED -a, protože "Petra" může být "Petr" + -a
-    if lo.endswith('u') and len(obs) > 1:
-        cand = obs[:-1]
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    # PRIORITA 5: Genitiv/Akuzativ -a → remove (Petra → Petr, ale i Jana → Jan)
-    if lo.endswith('a') and len(obs) > 1:
-        cand = obs[:-1]
-        if cand.lower() in CZECH_FIRST_NAMES:
-            return cand.capitalize()
-        cands.append(cand)
-
-    # Vrať první kandidát (pokud existuje)
-    return cands[0].capitalize() if cands else None
-
+    # Kandidát v knihovně vyhrává; jinak vrať první kandidát (pokud existuje)
+    first_cand = None
+    for suffix, min_len, repl in _MALE_CASE_RULES.get(lo[-1:], ()):
+        if len(obs) > min_len and lo.endswith(suffix):
+            cut = len(suffix)
+            cand = obs[:-cut] + repl
+            if lo[:-cut] + repl in CZECH_FIRST_NAMES:
+                return cand.capitalize()
+            if first_cand is None:
+                first_cand = cand
+
+    return first_cand.capitalize() if first_cand is not None else None
+
+# Závisí na knihovně jmen – cache se maže při každém načtení CZECH_FIRST_NAMES
+@lru_cache(maxsize=1 << 16)
 def infer_first_name_nominative(obs: str) -> str:
     """Odhadne nominativ křestního jména z pozorovaného tvaru.
 
@@ -226,20 +156,11 @@ def infer_first_name_nominative(obs: str) -> str:
         return obs.capitalize()
 
     # SPECIÁLNÍ VZORY - PRIORITA (před obecnými pravidly)
+    nom = _first_name_by_rules(obs, lo, _FIRST_NAME_SOFT_RULES)
+    if nom:
+        return nom
 
-    # 1. ice → ika (Anice → Anika, Clarice → Clarika)
-    if lo.endswith('ice') and len(obs) > 3:
-        stem_ika = obs[:-3] + 'ika'
-        if stem_ika.lower() in CZECH_FIRST_NAMES:
-            return stem_ika.capitalize()
-
-    # 2. ře → ra (Barbaře → Barbara, Saře → Sara)
-    if lo.endswith('ře') and len(obs) > 2:
-        stem_ra = obs[:-2] + 'ra'
-        if stem_ra.lower() in CZECH_FIRST_NAMES:
-            return stem_ra.capitalize()
-
-    # 3. Zkrácená jména (Han → Hana, Mart → Marta, ale NE David → Davida)
+    # Zkrácená jména (Han → Hana, Mart → Marta, ale NE David → Davida)
     # POUZE pro krátká jména (max 4 znaky) aby se předešlo chybám jako David → Davida
     if len(obs) <= 4:
         # Priorita: nejdřív zkus +ina (pro Mart → Martina), pak +a
@@ -248,24 +169,10 @@ def infer_first_name_nominative(obs: str) -> str:
         if lo + 'a' in CZECH_FIRST_NAMES:
             return (obs + 'a').capitalize()
 
-    # ŽENSKÁ JMÉNA - pádové varianty
-    # Genitiv/Dativ/Lokál: -y/-ě/-e → -a
-    if lo.endswith(('y', 'ě', 'e')):
-        stem = obs[:-1]
-        if (stem + 'a').lower() in CZECH_FIRST_NAMES:
-            return (stem + 'a').capitalize()
-
-    # Dativ: -u → -a (Hanu → Hana)
-    if lo.endswith('u') and len(obs) > 1:
-        stem = obs[:-1]
-        if (stem + 'a').lower() in CZECH_FIRST_NAMES:
-            return (stem + 'a').capitalize()
-
-    # Instrumentál: -ou → -a (Hanou → Hana)
-    if lo.endswith('ou') and len(obs) > 2:
-        stem = obs[:-2]
-        if (stem + 'a').lower() in CZECH_FIRST_NAMES:
-            return (stem + 'a').capitalize()
+    # ŽENSKÁ JMÉNA - pádové varianty (Genitiv/Dativ/Lokál/Instrumentál)
+    nom = _first_name_by_rules(obs, lo, _FIRST_NAME_CASE_RULES)
+    if nom:
+        return nom
 
     # MUŽSKÁ JMÉNA - genitiv/dativ/instrumentál
     male_nom = _male_genitive_to_nominative(obs)
@@ -274,14 +181,260 @@ def infer_first_name_nominative(obs: str) -> str:
 
     # POSSESSIVE FORMS - Petřin → Petra, Janin → Jana
     if lo.endswith('in') and len(obs) > 2:
-        stem = obs[:-2]
         # Zkus ženskou variantu (Petřin → Petra)
-        if (stem + 'a').lower() in CZECH_FIRST_NAMES:
-            return (stem + 'a').capitalize()
+        if lo[:-2] + 'a' in CZECH_FIRST_NAMES:
+            return (obs[:-2] + 'a').capitalize()
 
     # Pokud nic nepomohlo, vrať původní tvar s velkým písmenem
     return obs.capitalize()
 
+# =============== Pravidla koncovek příjmení ===============
+# Kmeny vyžadující vložné 'e' (Havl → Havel, Petr → Petra)
+_VLOZNE_E_STEMS = frozenset({
+    'havl', 'sed', 'pes', 'koz', 'voj', 'pav', 'petr', 'jos',
+    'alex', 'filip', 'luk', 'mar', 'dan', 'tom', 'jar', 'stef'
+})
+
+# Zvířecí/rostlinná příjmení - končí na -a už v nominativu (Liška, Vrba, Ryba)
+_ANIMAL_PLANT_SURNAMES = frozenset({
+    'liška', 'vrba', 'ryba', 'kočka', 'panda', 'veverka',
+    'sova', 'holub', 'vraná', 'zajíc', 'koza', 'ovečka',
+    'bříza', 'dub', 'jeřábek', 'jílková', 'kaštanka'
+})
+
+# Běžná příjmení končící na -a v nominativu (NEpřevádět -ka/-la → -ek/-el)
+_COMMON_SURNAMES_A = frozenset({
+    'svoboda', 'skála', 'hora', 'kula', 'hala', 'krejča',
+    'liška', 'vrba', 'ryba', 'kočka', 'sluka', 'janda',
+    'procházka', 'blaha', 'kafka', 'smetana', 'brabec',
+    'kuřátka', 'kubíčka', 'marečka', 'vašíčka'
+})
+
+# Příjmení končící na -ý už v nominativu
+_COMMON_Y_SURNAMES = frozenset({'hubený', 'malý', 'veselý', 'černý', 'bílý'})
+
+# Kategorie známých nominativů jako bitové příznaky – jeden dotaz do slovníku
+# místo testu v několika množinách (slovo může patřit do více kategorií)
+_CAT_ANIMAL_PLANT = 1
+_CAT_COMMON_A = 2
+_CAT_COMMON_Y = 4
+
+def _build_surname_categories() -> dict:
+    cats = {}
+    for words, flag in ((_ANIMAL_PLANT_SURNAMES, _CAT_ANIMAL_PLANT),
+                        (_COMMON_SURNAMES_A, _CAT_COMMON_A),
+                        (_COMMON_Y_SURNAMES, _CAT_COMMON_Y)):
+        for w in words:
+            cats[w] = cats.get(w, 0) | flag
+    return cats
+
+_SURNAME_CATEGORIES = _build_surname_categories()
+
+# České souhlásky (pro detekci shluku souhlásek před vložným 'e')
+_CONSONANTS = frozenset('bcčdďfghjklmnňpqrřsštťvwxzž')
+
+# Samohlásky na konci křestního jména (bez diakritiky)
+_VOWELS = frozenset('aeiouy')
+
+# Přípustné poslední písmeno 3písmenného křestního jména (Jan, Dan, Ivo);
+# jiné zakončení = zkrácený genitiv (Han z Hana)
+_SHORT_NAME_FINALS = frozenset('aeiouyáéíóúůýnlr')
+
+# Přípustné poslední písmeno 4-5písmenného křestního jména (+ typické mužské -š, -m)
+_NAME_FINALS = _SHORT_NAME_FINALS | frozenset('šm')
+
+# Koncovky pevné délky – test přes lo[-k:] in frozenset místo str.endswith(tuple)
+_ADJ_SK_CK = frozenset({'ský', 'cký'})
+_ADJ_SKE_CKE = frozenset({'ské', 'cké'})
+_ADJ_SKOU_CKOU = frozenset({'skou', 'ckou'})
+_L_INSTRUMENTAL = frozenset({'alem', 'elem', 'olem', 'ilem'})
+_SOFT_ASH = frozenset({'áš', 'iš'})
+_VELARS = frozenset({'k', 'g'})
+_I_FINALS = frozenset({'i', 'í'})
+
+# Pádové koncovky přídavných příjmení → počet odřezaných znaků (pak + 'ý')
+_ADJ_CUT = {'ého': 3, 'ému': 3, 'ým': 2, 'ém': 2}
+
+# Známé nominativy s vložným 'e' (Havel, Pavel)
+_VLOZNE_E_NOMINATIVES = frozenset({'havel', 'pavel'})
+
+def _sur_female_e(obs: str, lo: str) -> Optional[str]:
+    # -ové → -ová (genitiv), ale ne -ské/-cké (přídavné jméno)
+    if lo[-3:] not in _ADJ_SKE_CKE:
+        return obs[:-1] + 'á'
+    return None
+
+def _sur_female_ou(obs: str, lo: str) -> Optional[str]:
+    # -ou → -á (instrumentál), ale ne -skou/-ckou (přídavné jméno)
+    if lo[-4:] not in _ADJ_SKOU_CKOU:
+        return obs[:-2] + 'á'
+    return None
+
+def _sur_adjective(obs: str, lo: str) -> Optional[str]:
+    # -ého/-ému/-ým/-ém → -ý (délka koncovky z _ADJ_CUT)
+    cut = _ADJ_CUT.get(lo[-3:]) or _ADJ_CUT.get(lo[-2:])
+    return obs[:-cut] + 'ý'
+
+def _sur_adj_female(obs: str, lo: str) -> Optional[str]:
+    # -skou/-ckou → -ská/-cká (ženská přídavná)
+    return obs[:-3] + 'á'
+
+def _sur_vlozne_e(obs: str, lo: str) -> Optional[str]:
+    # Detekce: pokud lo končí na 'a' a stem (bez -a) je ve vlozne_e_stems
+    if lo[:-1] in _VLOZNE_E_STEMS:
+        return f"{obs[:-1]}e{obs[-1]}"  # "Havl" + "e" + "a" → není správně
+    return None
+
+def _sur_vlozne_e_consonants(obs: str, lo: str) -> Optional[str]:
+    # Pokud stem končí na souhlásku-souhlásku, vlož 'e' mezi ně
+    stem = obs[:-1]  # např. "Havl" z "Havla"
+    stem_lo = lo[:-1]
+    if len(stem) >= 2 and stem_lo[-2] in _CONSONANTS and stem_lo[-1] in _CONSONANTS:
+        # Zkontroluj známé případy
+        if stem_lo in _VLOZNE_E_STEMS or stem_lo + 'el' in _VLOZNE_E_NOMINATIVES:
+            return f"{stem[:-1]}e{stem[-1]}"
+    return None
+
+def _sur_animal_plant(obs: str, lo: str) -> Optional[str]:
+    # NEODSTRAŇUJ -a, pokud je to zvířecí nebo rostlinné příjmení
+    return obs if _SURNAME_CATEGORIES.get(lo, 0) & _CAT_ANIMAL_PLANT else None
+
+def _sur_ka(obs: str, lo: str) -> Optional[str]:
+    # Hájek → Hájka (genitiv) → návrat na Hájek
+    return obs[:-2] + 'ek' if not _SURNAME_CATEGORIES.get(lo, 0) & _CAT_COMMON_A else None
+
+def _sur_la(obs: str, lo: str) -> Optional[str]:
+    # Havel → Havla (genitiv) → návrat na Havel
+    return obs[:-2] + 'el' if not _SURNAME_CATEGORIES.get(lo, 0) & _CAT_COMMON_A else None
+
+def _sur_ce(obs: str, lo: str) -> Optional[str]:
+    # Němec → Němce (genitiv) → návrat na Němec
+    return obs[:-2] + 'ec'
+
+def _sur_dative_ovi(obs: str, lo: str) -> Optional[str]:
+    # Novákovi → Novák
+    return obs[:-3]
+
+def _sur_instrumental_em(obs: str, lo: str) -> Optional[str]:
+    # -alem, -elem, -olem, -ilem → pravděpodobně instrumentál od -al, -el, -ol, -il
+    # (Doležalem → Doležal, Kokolem → Kokol)
+    if lo[-4:] in _L_INSTRUMENTAL:
+        return obs[:-2]
+    # Kontrola: není -bem, -dem, -cem, -sem, -šem (součást příjmení)
+    if not lo.endswith(('bem', 'dem', 'cem', 'sem', 'šem', 'chem', 'gem')):
+        # Novákem → Novák
+        return obs[:-2]
+    return None
+
+def _sur_genitive_y(obs: str, lo: str) -> Optional[str]:
+    # Procházky (genitiv) → Procházka (nominativ), ale ne přídavná jména
+    if lo[-3:] not in _ADJ_SK_CK and not lo.endswith('ný') and not _SURNAME_CATEGORIES.get(lo, 0) & _CAT_COMMON_Y:
+        return obs[:-1] + 'a'
+    return None
+
+# Pravidla v pořadí PRIORITY: (koncovka, len(obs) musí být větší než, handler)
+# Handler vrací nominativ, nebo None → pokračuje se dalším pravidlem.
+# Prázdná koncovka odpovídá každému slovu.
+_SURNAME_RULES = (
+    # ŽENSKÁ PŘÍJMENÍ
+    ('é', 3, _sur_female_e),
+    ('ou', 3, _sur_female_ou),
+    # PŘÍDAVNÁ JMÉNA (-ský, -cký, -ý)
+    *((suffix, 0, _sur_adjective) for suffix in _ADJ_CUT),
+    ('skou', 0, _sur_adj_female),
+    ('ckou', 0, _sur_adj_female),
+    # VLOŽNÉ 'E'
+    ('a', 2, _sur_vlozne_e),
+    ('a', 3, _sur_vlozne_e_consonants),
+    # ZVÍŘECÍ PŘÍJMENÍ
+    ('', 0, _sur_animal_plant),
+    # SPECIÁLNÍ PŘÍPADY: -ka, -la, -ce → -ek, -el, -ec
+    ('ka', 3, _sur_ka),
+    ('la', 3, _sur_la),
+    ('ce', 3, _sur_ce),
+    # DATIV: -ovi → REMOVE
+    ('ovi', 5, _sur_dative_ovi),
+    # INSTRUMENTÁL: -em → REMOVE
+    ('em', 4, _sur_instrumental_em),
+    # GENITIV: -y → -a
+    ('y', 2, _sur_genitive_y),
+)
+
+def _build_suffix_trie(rules) -> dict:
+    """Postaví trie z obrácených koncovek pravidel.
+
+    Uzel je dict znak → podstrom; klíč None nese id pravidel končících v uzlu.
+    Po sobě jdoucí pravidla se stejnou akcí (min. délka, handler) sdílejí id
+    prvního z nich, aby se jejich listy daly při minimalizaci sloučit.
+    """
+    root = {}
+    action_id = None
+    prev_action = None
+    for rule_id, (suffix, min_len, handler) in enumerate(rules):
+        if (min_len, handler) != prev_action:
+            action_id, prev_action = rule_id, (min_len, handler)
+        node = root
+        for ch in reversed(suffix):
+            node = node.setdefault(ch, {})
+        node.setdefault(None, []).append(action_id)
+    return root
+
+def _minimize_suffix_trie(node: dict, registry: dict = None) -> dict:
+    """Sloučí shodné podstromy trie (acyklická minimalizace zdola nahoru).
+
+    Uzly se stejnými pravidly a stejnými přechody se nahradí jedním sdíleným
+    objektem – méně uzlů v paměti, výsledek dotazů se nemění.
+    """
+    if registry is None:
+        registry = {}
+    for ch in [k for k in node if k is not None]:
+        node[ch] = _minimize_suffix_trie(node[ch], registry)
+    signature = (
+        tuple(node.get(None, ())),
+        tuple(sorted((ch, id(child)) for ch, child in node.items() if ch is not None)),
+    )
+    return registry.setdefault(signature, node)
+
+def _match_suffix_rules(trie: dict, lo: str) -> list:
+    """Vrátí id všech pravidel, jejichž koncovka sedí na slovo, seřazená dle priority.
+
+    Jeden průchod slovem od konce místo desítek volání str.endswith().
+    """
+    node = trie
+    ids = list(node.get(None, ()))
+    for ch in reversed(lo):
+        node = node.get(ch)
+        if node is None:
+            break
+        ids.extend(node.get(None, ()))
+    ids.sort()
+    return ids
+
+_SURNAME_SUFFIX_TRIE = _minimize_suffix_trie(_build_suffix_trie(_SURNAME_RULES))
+
+# Sada pravidel závisí jen na posledních _SURNAME_MAX_SUFFIX znacích slova
+# a na jeho délce (min. délky pravidel jsou malé, delší slova splní všechny) –
+# průchod trie i test délek se pro každou kombinaci provede jednou, dál jen
+# dotaz do tabulky, která rovnou vrací handlery v pořadí priority
+_SURNAME_MAX_SUFFIX = max(len(suffix) for suffix, _, _ in _SURNAME_RULES)
+_SURNAME_LEN_CAP = max(min_len for _, min_len, _ in _SURNAME_RULES) + 1
+_SURNAME_TAIL_RULES = {}
+
+def _surname_handlers_for(lo: str, n: int) -> tuple:
+    key = (lo[-_SURNAME_MAX_SUFFIX:], min(n, _SURNAME_LEN_CAP))
+    handlers = _SURNAME_TAIL_RULES.get(key)
+    if handlers is None:
+        handlers = _SURNAME_TAIL_RULES[key] = tuple(
+            _SURNAME_RULES[rule_id][2]
+            for rule_id in _match_suffix_rules(_SURNAME_SUFFIX_TRIE, key[0])
+            if key[1] > _SURNAME_RULES[rule_id][1]
+        )
+    return handlers
+
+# Čistá funkce (nezávisí na knihovně jmen) – stejná příjmení se v dokumentu
+# opakují, výsledek se proto cachuje podle vstupního tvaru. Vrácené nominativy
+# jsou internované – slouží jako klíče entity_map a tagů osob
+@lru_cache(maxsize=1 << 16)
 def infer_surname_nominative(obs: str) -> str:
     """Odhadne nominativ příjmení z pozorovaného tvaru.
 
@@ -291,151 +444,59 @@ def infer_surname_nominative(obs: str) -> str:
     - Vložné 'e' (Havl → Havel, Petr → Petra)
     - Zvířecí příjmení (Liška, Vrba)
     - Všechny pády
+
+    Pravidla viz _SURNAME_RULES; kandidáti se hledají jedním průchodem
+    trie obrácených koncovek (_SURNAME_SUFFIX_TRIE), zapamatovaným
+    podle zakončení a délky slova (_SURNAME_TAIL_RULES).
     """
     lo = obs.lower()
 
-    # ========== ŽENSKÁ PŘÍJMENÍ ==========
-
-    # -ové/-ou → -ová (genitiv/instrumentál)
-    if lo.endswith('é') and len(obs) > 3:
-        # Kontrola, že není -ské/-cké (přídavné jméno)
-        if not lo.endswith(('ské', 'cké')):
-            return obs[:-1] + 'á'
-    if lo.endswith('ou') and len(obs) > 3:
-        # Kontrola, že není -skou/-ckou (přídavné jméno)
-        if not lo.endswith(('skou', 'ckou')):
-            return obs[:-2] + 'á'
-
-    # ========== PŘÍDAVNÁ JMÉNA (-ský, -cký, -ý) ==========
-
-    if lo.endswith(('ého', 'ému', 'ým', 'ém')):
-        # Všechny tyto koncovky → -ý
-        if lo.endswith('ého'):
-            return obs[:-3] + 'ý'
-        elif lo.endswith('ému'):
-            return obs[:-3] + 'ý'
-        elif lo.endswith('ým'):
-            return obs[:-2] + 'ý'
-        elif lo.endswith('ém'):
-            return obs[:-2] + 'ý'
+    for handler in _surname_handlers_for(lo, len(obs)):
+        result = handler(obs, lo)
+        if result is not None:
+            return sys.intern(result)
 
-    # -skou/-ckou → -ská/-cká (ženská přídavná)
-    if lo.endswith(('skou', 'ckou')):
-        return obs[:-3] + 'á'
-
-    # ========== VLOŽNÉ 'E' - Havl/Havla → Havel, Petr/Petra → Petra ==========
-
-    # Seznam kmenů vyžadujících vložné e
-    vlozne_e_stems = {
-        'havl', 'sed', 'pes', 'koz', 'voj', 'pav', 'petr', 'jos',
-        'alex', 'filip', 'luk', 'mar', 'dan', 'tom', 'jar', 'stef'
-    }
+    return sys.intern(obs)
 
-    # Detekce: pokud lo končí na 'a' a stem (bez -a) je ve vlozne_e_stems
-    if lo.endswith('a') and len(obs) > 2:
-        stem_without_a = lo[:-1]  # např. "havl" z "havla"
-        if stem_without_a in vlozne_e_stems:
-            # Vlož 'e' před poslední souhlásku
-            # Havl → Havel (vložit před 'l')
-            # Petr → Petra (vložit před 'r')
-            return obs[:-1] + 'e' + obs[-1]  # "Havl" + "e" + "a" → není správně
-
-    # Lepší implementace vložného e:
-    # Pokud stem končí na souhlásku-souhlásku, vlož 'e' mezi ně
-    if lo.endswith('a') and len(obs) > 3:
-        stem = obs[:-1]  # např. "Havl" z "Havla"
-        stem_lo = stem.lower()
-        # Kontrola, jestli předposlední a poslední znak jsou souhlásky
-        consonants = 'bcčdďfghjklmnňpqrřsštťvwxzž'
-        if len(stem) >= 2 and stem_lo[-2] in consonants and stem_lo[-1] in consonants:
-            # Zkontroluj známé případy
-            if stem_lo in vlozne_e_stems or stem_lo + 'e' + 'l' in ['havel', 'pavel']:
-                # Vlož 'e' mezi poslední dvě souhlásky
-                return stem[:-1] + 'e' + stem[-1]
-
-    # ========== ZVÍŘECÍ PŘÍJMENÍ ==========
-    # Liška, Vrba, Ryba, Kočka, Panda, atd. - končí na -a v nominativu!
-    # NEODSTRAŇUJ -a, pokud je to zvířecí nebo rostlinné příjmení
+def infer_surnames_nominative(words: list) -> list:
+    """Dávková varianta infer_surname_nominative se zachováním pořadí.
 
-    animal_plant_surnames = {
-        'liška', 'vrba', 'ryba', 'kočka', 'panda', 'veverka',
-        'sova', 'holub', 'vraná', 'zajíc', 'koza', 'ovečka',
-        'bříza', 'dub', 'jeřábek', 'jílková', 'kaštanka'
-    }
-
-    if lo in animal_plant_surnames:
-        return obs  # Zachovej nominativ
-
-    # ========== SPECIÁLNÍ PŘÍPADY: -ka, -la, -ce → -ek, -el, -ec ==========
-
-    # Ale POUZE pokud to NENÍ běžné příjmení končící na -a v nominativu
-    common_surnames_a = {
-        'svoboda', 'skála', 'hora', 'kula', 'hala', 'krejča',
-        'liška', 'vrba', 'ryba', 'kočka', 'sluka', 'janda',
-        'procházka', 'blaha', 'kafka', 'smetana', 'brabec',
-        'kuřátka', 'kubíčka', 'marečka', 'vašíčka'
-    }
-
-    if lo.endswith('ka') and len(obs) > 3 and lo not in common_surnames_a:
-        # Hájek → Hájka (genitiv) → návrat na Hájek
-        return obs[:-2] + 'ek'
-
-    if lo.endswith('la') and len(obs) > 3 and lo not in common_surnames_a:
-        # Havel → Havla (genitiv) → návrat na Havel
-        return obs[:-2] + 'el'
-
-    if lo.endswith('ce') and len(obs) > 3:
-        # Němec → Němce (genitiv) → návrat na Němec
-        return obs[:-2] + 'ec'
-
-    # ========== DATIV: -ovi → REMOVE ==========
-
-    if lo.endswith('ovi') and len(obs) > 5:
-        # Novákovi → Novák
-        return obs[:-3]
-
-    # ========== INSTRUMENTÁL: -em → REMOVE ==========
-
-    # Ale POUZE pokud to není součást příjmení (Šembera, Chlumec, atd.)
-    if lo.endswith('em') and len(obs) > 4:
-        # Speciální případ: -alem, -elem, -olem → pravděpodobně instrumentál od -al, -el, -ol
-        if lo.endswith(('alem', 'elem', 'olem', 'ilem')):
-            # Doležalem → Doležal, Havlem → Havel, Kokolem → Kokol
-            # Ale Havel má výjimku výš (řádek 383-385), takže tady řešíme jen -al/-ol/-il
-            if lo.endswith('alem'):
-                return obs[:-2]  # Doležalem → Doležal
-            elif lo.endswith('elem'):
-                return obs[:-2]  # ?elem → ?el (edge case)
-            elif lo.endswith('olem'):
-                return obs[:-2]  # ?olem → ?ol
-            elif lo.endswith('ilem'):
-                return obs[:-2]  # ?ilem → ?il
-        # Kontrola: není -bem, -dem, -cem, -sem, -šem (součást příjmení)
-        elif not lo.endswith(('bem', 'dem', 'cem', 'sem', 'šem', 'chem', 'gem')):
-            # Novákem → Novák, Procházkou → Procházka
-            return obs[:-2]
-
-    # ========== GENITIV: -a → NEODSTRAŇUJ! ==========
-    # Mnoho příjmení končí na -a v nominativu (Svoboda, Skála, Liška, atd.)
-    # Příliš riskantní, necháme to být
-
-    # ========== GENITIV: -y → -a ==========
-    # Procházky (genitiv) → Procházka (nominativ)
-    # ALE POUZE pokud to NENÍ přídavné jméno (-ský/-cký/-ný)
-    if lo.endswith('y') and len(obs) > 2:
-        # Skip if it's adjective form
-        if not lo.endswith(('ský', 'cký', 'ný')):
-            # Genitiv of surnames ending in -a: Procházka → Procházky
-            # So reverse: Procházky → Procházka
-            # But check if it's not a common surname ending with 'y' in nominative
-            common_y_surnames = {'hubený', 'malý', 'veselý', 'černý', 'bílý'}
-            if lo not in common_y_surnames:
-                candidate = obs[:-1] + 'a'
-                return candidate
-
-    return obs
+    Každý unikátní tvar se vyhodnotí jen jednou, výsledky se rozmístí zpět.
+    """
+    mapped = {w: infer_surname_nominative(w) for w in dict.fromkeys(words)}
+    return [mapped[w] for w in words]
 
 # =============== Varianty pro nahrazování ===============
+# Pádové koncovky – přidávají se jedním V.update() bez dočasných množin
+_POSSESSIVE_SUFFIXES = ('ův', 'ova', 'ovo', 'ovu', 'ovou', 'ově')
+_FEMININE_POSSESSIVE_SUFFIXES = ('in', 'ina', 'iny', 'iné', 'inu', 'inou', 'iným', 'iných', 'ino')
+_SOFT_SUFFIXES = ('e', 'i')
+
+_FIRST_FEM_A_SUFFIXES = ('y', 'e', 'ě', 'u', 'ou', 'o') + _FEMININE_POSSESSIVE_SUFFIXES
+_FIRST_MALE_SUFFIXES = (
+    ('a', 'ovi', 'e', 'em', 'u', 'om') + _POSSESSIVE_SUFFIXES
+    + ('ovy', 'ovým', 'ových', 'ove')
+)
+_FIRST_EK_EL_SUFFIXES = ('a', 'ovi', 'em', 'u', 'e')
+_FIRST_EC_SUFFIXES = ('e', 'i', 'em', 'u')
+_FIRST_I_SUFFIXES = ('ího', 'ímu', 'ím', 'íh')
+_FIRST_ASH_SUFFIXES = ('e', 'i', 'em', 'ovi')
+_FIRST_LOCATIVE_SUFFIXES = ('ovi', 'e')
+
+_SURNAME_OVA_SUFFIXES = ('é', 'ou', 'á')
+_SURNAME_OVA_PLURAL_SUFFIXES = ('ových', 'ovým', 'ové')
+_SURNAME_ADJ_SUFFIXES = ('ý', 'ého', 'ému', 'ým', 'ém', 'á', 'é', 'ou', 'ých', 'ými')
+_SURNAME_A_FEMININE_SUFFIXES = ('é', 'ou', 'á')
+_SURNAME_EK_SUFFIXES = ('a', 'ovi', 'em', 'u', 'e', 'y', 'ou') + _POSSESSIVE_SUFFIXES + ('ů', 'ům')
+_SURNAME_EC_SUFFIXES = (
+    ('e', 'i', 'em', 'u', 'y', 'ů', 'ům', 'ích', 'ech', 'emi') + _POSSESSIVE_SUFFIXES
+)
+_SURNAME_A_SUFFIXES = ('y', 'ovi', 'ou', 'u', 'e', 'o') + _POSSESSIVE_SUFFIXES + ('ů', 'ům')
+_SURNAME_CONSONANT_SUFFIXES = (
+    ('a', 'ovi', 'e', 'em', 'u') + _POSSESSIVE_SUFFIXES
+    + ('ovy', 'ovým', 'ových', 'ove', 'ů', 'ům', 'y', 'ích', 'ech')
+)
+
 def variants_for_first(first: str) -> set:
     """
     Generuje všechny pádové varianty křestního jména včetně:
@@ -444,84 +505,72 @@ def variants_for_first(first: str) -> set:
     """
     f = first.strip()
     if not f: return {''}
-    V = {f, f.lower(), f.capitalize()}
     low = f.lower()
+    V = {f, low, f.capitalize()}
 
     # ========== Ženská jména končící na -a ==========
     if low.endswith('a'):
         stem = f[:-1]
         # Základní pády: Gen/Dat/Akuz/Vok/Lok/Instr
-        V |= {stem+'y', stem+'e', stem+'ě', stem+'u', stem+'ou', stem+'o'}
-
-        # Přivlastňovací přídavná jména (Janin dům, Petřina kniha)
-        V |= {stem+s for s in ['in','ina','iny','iné','inu','inou','iným','iných','ino']}
+        # + přivlastňovací přídavná jména (Janin dům, Petřina kniha)
+        V.update([stem + suf for suf in _FIRST_FEM_A_SUFFIXES])
 
         # Speciální případy pro měkčení (Petra → Petře, Veronka → Verunce)
         if stem.endswith('k'):
-            V.add(stem[:-1] + 'c' + 'e')
-            V.add(stem[:-1] + 'c' + 'i')
+            soft_stem = stem[:-1] + 'c'
+            V.update([soft_stem + suf for suf in _SOFT_SUFFIXES])
 
         # Speciální měkčení tr → tř (Petra → Petřin)
         if stem.endswith('tr'):
             soft_stem = stem[:-1] + 'ř'
-            V |= {soft_stem+s for s in ['in','ina','iny','iné','inu','inou','iným','iných','ino']}
+            V.update([soft_stem + suf for suf in _FEMININE_POSSESSIVE_SUFFIXES])
 
         # Speciální měkčení h → z, ch → š, k → c, r → ř
         if stem.endswith('h'):
             soft_stem = stem[:-1] + 'z'
-            V.add(soft_stem + 'e')
-            V.add(soft_stem + 'i')
+            V.update([soft_stem + suf for suf in _SOFT_SUFFIXES])
         if stem.endswith('ch'):
             soft_stem = stem[:-2] + 'š'
-            V.add(soft_stem + 'e')
-            V.add(soft_stem + 'i')
-        if stem.endswith(('k', 'g')):
+            V.update([soft_stem + suf for suf in _SOFT_SUFFIXES])
+        if stem[-1:] in _VELARS:
             soft_stem = stem[:-1] + 'c'
-            V.add(soft_stem + 'e')
-            V.add(soft_stem + 'i')
+            V.update([soft_stem + suf for suf in _SOFT_SUFFIXES])
         if stem.endswith('r') and not stem.endswith('tr'):
             soft_stem = stem[:-1] + 'ř'
-            V.add(soft_stem + 'e')
-            V.add(soft_stem + 'i')
+            V.update([soft_stem + suf for suf in _SOFT_SUFFIXES])
 
     # ========== Mužská jména ==========
     else:
-        # Základní pády
-        V |= {f+'a', f+'ovi', f+'e', f+'em', f+'u', f+'om'}
-
-        # Přivlastňovací přídavná jména (Petrův dům, Petrova kniha)
-        V |= {f+'ův', f+'ova', f+'ovo', f+'ovu', f+'ovou', f+'ově'}
-        V |= {f+'ov'+s for s in ['a','o','y','ě','ým','ých','ou','u','e']}
+        # Základní pády + přivlastňovací přídavná jména (Petrův dům, Petrova kniha)
+        V.update([f + suf for suf in _FIRST_MALE_SUFFIXES])
 
         # Speciální případy pro zakončení -ek, -el
         if low.endswith('ek'):
             stem_k = f[:-2] + 'k'
-            V |= {stem_k+'a', stem_k+'ovi', stem_k+'em', stem_k+'u', stem_k+'e'}
-            V.add(f[:-2] + 'ka')
+            V.update([stem_k + suf for suf in _FIRST_EK_EL_SUFFIXES])
 
         if low.endswith('el'):
             stem_l = f[:-2] + 'l'
-            V |= {stem_l+'a', stem_l+'ovi', stem_l+'em', stem_l+'u', stem_l+'e'}
-            V.add(f[:-2] + 'la')
+            V.update([stem_l + suf for suf in _FIRST_EK_EL_SUFFIXES])
 
         # Speciální případy pro zakončení -ec
         if low.endswith('ec'):
             stem_c = f[:-2] + 'c'
-            V |= {stem_c+'e', stem_c+'i', stem_c+'em', stem_c+'u'}
+            V.update([stem_c + suf for suf in _FIRST_EC_SUFFIXES])
 
         # Speciální případ: Jiří → Jiřího, Jiřímu, Jiřím, Jiřího
         if low.endswith('í'):
             stem = f[:-1]
-            V |= {stem+'ího', stem+'ímu', stem+'ím', stem+'íh'}
+            V.update([stem + suf for suf in _FIRST_I_SUFFIXES])
 
         # Speciální případ: -iš/-aš → měkčení (Lukáš, Tomáš)
-        if low.endswith(('áš', 'iš')):
+        if low[-2:] in _SOFT_ASH:
             stem_base = f[:-1]
-            V |= {stem_base+'e', stem_base+'i', stem_base+'em', stem_base+'ovi'}
+            V.update([stem_base + suf for suf in _FIRST_ASH_SUFFIXES])
 
         # Lokál s měkčením
-        if not low.endswith(('i', 'í')):
-            V |= {f+'ovi', f+'e'}
+        if low[-1:] not in _I_FINALS:
+            V.update([f + suf for suf in _FIRST_LOCATIVE_SUFFIXES])
 
     return V
 
@@ -534,131 +583,131 @@ def variants_for_surname(surname: str) -> set:
     """
     s = surname.strip()
     if not s: return {''}
-    out = {s, s.lower(), s.capitalize()}
     low = s.lower()
+    out = {s, low, s.capitalize()}
 
     # ========== Příjmení typu -ová (ženská) ==========
     if low.endswith('ová'):
         base = s[:-1]
-        out |= {
-            s,
-            base+'é',
-            base+'ou',
-            base+'á',
-        }
+        out.update([base + suf for suf in _SURNAME_OVA_SUFFIXES])
         base_stem = s[:-3]
-        out |= {
-            base_stem+'ových',
-            base_stem+'ovým',
-            base_stem+'ové',
-        }
+        out.update([base_stem + suf for suf in _SURNAME_OVA_PLURAL_SUFFIXES])
         return out
 
     # ========== Příjmení typu -ský/-cký (přídavná jména) ==========
-    if low.endswith(('ský','cký')):
+    if low[-3:] in _ADJ_SK_CK:
         stem = s[:-2]
-        out |= {
-            stem+'ý', stem+'ého', stem+'ému', stem+'ým', stem+'ém',
-            stem+'á', stem+'é', stem+'ou',
-            stem+'ých', stem+'ými'
-        }
+        out.update([stem + suf for suf in _SURNAME_ADJ_SUFFIXES])
         return out
 
     # ========== Obecná přídavná jména končící na -ý ==========
     if low.endswith('ý'):
         stem = s[:-1]
-        out |= {
-            stem+'ý', stem+'ého', stem+'ému', stem+'ým', stem+'ém',
-            stem+'á', stem+'é', stem+'ou',
-            stem+'ých', stem+'ými'
-        }
+        out.update([stem + suf for suf in _SURNAME_ADJ_SUFFIXES])
         return out
 
     # ========== Ženská příjmení na -á (ne -ová) ==========
     if low.endswith('á') and not low.endswith('ová'):
         stem = s[:-1]
-        out |= {s, stem+'é', stem+'ou', stem+'á'}
+        out.update([stem + suf for suf in _SURNAME_A_FEMININE_SUFFIXES])
         return out
 
     # ========== Příjmení typu -ek (Dvořáček, Hájek) ==========
     if low.endswith('ek') and len(s) >= 3:
         stem_k = s[:-2] + 'k'
-        out |= {
-            s,
-            stem_k+'a', stem_k+'ovi', stem_k+'em', stem_k+'u', stem_k+'e',
-            stem_k+'y', stem_k+'ou',
-        }
-        out |= {
-            stem_k+'ův', stem_k+'ova', stem_k+'ovo',
-            stem_k+'ovu', stem_k+'ovou', stem_k+'ově'
-        }
-        out |= {
-            stem_k+'ů', stem_k+'ům', stem_k+'y',
-        }
+        out.update([stem_k + suf for suf in _SURNAME_EK_SUFFIXES])
         return out
 
     # ========== Příjmení typu -ec (Němec, Konec) ==========
     if low.endswith('ec') and len(s) >= 3:
         stem_c = s[:-2] + 'c'
-        out |= {
-            s,
-            stem_c+'e', stem_c+'i', stem_c+'em', stem_c+'u', stem_c+'y',
-        }
-        out |= {
-            stem_c+'ů', stem_c+'ům', stem_c+'ích', stem_c+'ech', stem_c+'emi',
-        }
-        out |= {
-            stem_c+'ův', stem_c+'ova', stem_c+'ovo',
-            stem_c+'ovu', stem_c+'ovou', stem_c+'ově'
-        }
+        out.update([stem_c + suf for suf in _SURNAME_EC_SUFFIXES])
         return out
 
     # ========== Příjmení na -a (mužská i ženská) ==========
     if low.endswith('a') and len(s) >= 2 and not low.endswith('ová'):
         stem = s[:-1]
-        out |= {
-            s,
-            stem+'y', stem+'ovi', stem+'ou', stem+'u', stem+'e', stem+'o',
-        }
-        out |= {
-            stem+'ův', stem+'ova', stem+'ovo',
-            stem+'ovu', stem+'ovou', stem+'ově'
-        }
-        out |= {
-            stem+'ů', stem+'ům', stem+'y',
-        }
+        out.update([stem + suf for suf in _SURNAME_A_SUFFIXES])
         return out
 
     # ========== Obecná mužská příjmení (konsonantní kmeny) ==========
-    out |= {
-        s+'a', s+'ovi', s+'e', s+'em', s+'u',
-    }
-    out |= {
-        s+'ův', s+'ova', s+'ovo',
-        s+'ovu', s+'ovou', s+'ově'
-    }
-    out |= {
-        s+'ov'+suf for suf in ['a','o','y','ě','ým','ých','ou','u','e','i']
-    }
-    out |= {
-        s+'ů', s+'ům', s+'y', s+'ích', s+'ech',
-    }
+    out.update([s + suf for suf in _SURNAME_CONSONANT_SUFFIXES])
 
     return out
 
 # =============== Regexy ===============
 
+# Třídy \s a \d v Pythonu jsou unicodové, v RE2 jen ASCII – při překladu
+# vzoru pro RE2 se nahrazují explicitním výčtem (stejná sada jako str.isspace)
+_RE2_CLASS_BODY = {
+    's': r'\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\x{1680}\x{2000}-\x{200a}'
+         r'\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}',
+    'd': r'\p{Nd}',
+}
+
+def _to_re2_pattern(pattern: str) -> Optional[str]:
+    """Přeloží vzor pro RE2, nebo vrátí None, pokud by se sémantika lišila.
+
+    RE2 nezná lookaround ani zpětné reference a jeho \\b, \\w i $ se chovají
+    jinak než v Pythonu – takové vzory zůstávají na modulu re.
+    """
+    out = []
+    in_class = False
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '\\':
+            nxt = pattern[i + 1:i + 2]
+            if nxt in ('s', 'd'):
+                body = _RE2_CLASS_BODY[nxt]
+                out.append(body if in_class else f'[{body}]')
+            elif nxt in ('S', 'D'):
+                if in_class:
+                    return None
+                out.append(f'[^{_RE2_CLASS_BODY[nxt.lower()]}]')
+            elif not nxt or nxt in 'bBwWAZ' or nxt.isdigit():
+                return None
+            else:
+                out.append(c + nxt)
+            i += 2
+            continue
+        if in_class:
+            if c == ']':
+                in_class = False
+        elif c == '[':
+            in_class = True
+        elif c == '$':
+            return None
+        elif pattern.startswith(('(?=', '(?!', '(?<=', '(?<!', '(?P='), i):
+            return None
+        out.append(c)
+        i += 1
+    return ''.join(out)
+
+def _compile_pii(pattern: str, flags: int = 0):
+    """Zkompiluje PII vzor přes RE2 (je-li k dispozici a vzor to dovolí), jinak přes re."""
+    if re2 is not None and not flags & ~(re.IGNORECASE | re.UNICODE):
+        translated = _to_re2_pattern(pattern)
+        if translated is not None:
+            try:
+                return re2.compile(('(?i)' if flags & re.IGNORECASE else '') + translated)
+            except Exception:
+                pass
+    return re.compile(pattern, flags)
+
 # Vylepšený ADDRESS_RE - zachytává adresy i bez prefixů
-ADDRESS_RE = re.compile(
-    r'(?<!\[)'
-    r'(?:'
+# Prefix adresy ("bytem", "sídlo:", "trvalý pobyt:", ...)
+_ADDRESS_PREFIX = (
     r'(?:(?:trvale\s+)?bytem\s+|'
     r'(?:trvalé\s+)?bydlišt[eě]\s*:\s*|'
     r'(?:sídlo(?:\s+podnikání)?|se\s+sídlem)\s*:\s*|'
     r'(?:místo\s+podnikání)\s*:\s*|'
     r'(?:adresa|trvalý\s+pobyt)\s*:\s*|'
-    r'(?:v\s+ulic[ií]|na\s+(?:adrese|ulici)|v\s+dom[eě])\s+)?'
-    r')'
+    r'(?:v\s+ulic[ií]|na\s+(?:adrese|ulici)|v\s+dom[eě])\s+)'
+)
+# Samotná adresa: ulice číslo, PSČ obec
+_ADDRESS_BODY = (
     r'[A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ]'
     r'[a-záčďéěíňóřšťúůýž\s]{2,50}?'
     r'\s+\d{1,4}(?:/\d{1,4})?'
@@ -667,16 +716,69 @@ ADDRESS_RE = re.compile(
     r'\s+'
     r'[A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž\s]{1,30}'
     r'(?:\s+\d{1,2})?'
-    r'(?=\s|$|,|\.|;|:|\n|\r|Rodné|IČO|DIČ|Tel|E-mail|Kontakt|OP|Datum|Narozen)',
+    r'(?=\s|$|,|\.|;|:|\n|\r|Rodné|IČO|DIČ|Tel|E-mail|Kontakt|OP|Datum|Narozen)'
+)
+ADDRESS_RE = _compile_pii(
+    r'(?<!\[)(?:' + _ADDRESS_PREFIX + r')?' + _ADDRESS_BODY,
     re.IGNORECASE | re.UNICODE
 )
+# Obě větve ADDRESS_RE zvlášť – bez volitelné skupiny, kterou by engine
+# zkoušel a zahazoval na každé pozici (viz _sub_address)
+_ADDRESS_PREFIXED_RE = _compile_pii(r'(?<!\[)' + _ADDRESS_PREFIX + _ADDRESS_BODY, re.IGNORECASE | re.UNICODE)
+_ADDRESS_BARE_RE = _compile_pii(r'(?<!\[)' + _ADDRESS_BODY, re.IGNORECASE | re.UNICODE)
+
+# Prefix adresy ve štítku ("Sídlo: ...", "Trvalé bydliště: ...") – odstraní se
+# z hodnoty v _get_or_create_label (ukotveno na začátek, nahrazuje se nejvýše jednou)
+_ADDRESS_LABEL_PREFIX_RE = re.compile(
+    r'^(Sídlo|Trvalé\s+bydliště|Trvalý\s+pobyt|Bydliště|Adresa|Místo\s+podnikání|Se\s+sídlem|Bytem)\s*:\s*',
+    re.IGNORECASE
+)
+
+# Libovolná číslice – vstupní test pro vzory, které bez číslice nemohou uspět
+_DIGIT_RE = re.compile(r'\d')
+
+# Oddělovač hodnoty (heslo: x, Key=x, host - x) – vstupní test pro vzory
+# "klíčové slovo [:-=] hodnota", které bez něj nemohou uspět
+_ASSIGN_SEP_RE = re.compile(r'[:\-=]')
+
+# Předložky před rokem/obdobím ("od 2016", "roku 2020") – číslo pak není SPZ
+_PLATE_YEAR_CONTEXT_RE = re.compile(r'od |z |do |roku ')
+
+# Levný předfiltr pro ADDRESS_RE: každá adresa obsahuje "číslo, PSČ " – bez něj
+# se drahý vzor (líné kvantifikátory + lookaround) vůbec nespouští
+_ADDRESS_HINT_RE = _compile_pii(r'\d,\s*\d{3}\s?\d{2}\s')
+
+def _sub_address(repl, text: str) -> str:
+    """Ekvivalent ADDRESS_RE.sub(repl, text) složený ze dvou větví.
+
+    Vyhrává nejlevější shoda; na stejné pozici má přednost varianta
+    s prefixem (stejně jako hladový volitelný prefix v ADDRESS_RE).
+    """
+    out = []
+    pos = 0
+    m_pre = _ADDRESS_PREFIXED_RE.search(text)
+    m_bare = _ADDRESS_BARE_RE.search(text)
+    while m_pre or m_bare:
+        if m_pre and (not m_bare or m_pre.start() <= m_bare.start()):
+            m = m_pre
+        else:
+            m = m_bare
+        out.append(text[pos:m.start()])
+        out.append(repl(m))
+        pos = m.end()
+        if m_pre and m_pre.start() < pos:
+            m_pre = _ADDRESS_PREFIXED_RE.search(text, pos)
+        if m_bare and m_bare.start() < pos:
+            m_bare = _ADDRESS_BARE_RE.search(text, pos)
+    out.append(text[pos:])
+    return ''.join(out)
 
 # SPZ/RZ (Státní poznávací značky)
 # České SPZ formáty:
 # - Formát XYZ NNNN: 4A5 6789, 1P2 3456 (číslice-písmeno-číslice mezera 4 číslice)
 # - Formát XYY NNNN: 1AB 2345 (číslice-2písmena mezera 4 číslice)
 # - S prefixem: "SPZ: ...", "RZ: ...", "reg. značka: ..."
-LICENSE_PLATE_RE = re.compile(
+LICENSE_PLATE_RE = _compile_pii(
     r'(?:'
     r'(?:SPZ|RZ|reg\.?\s*(?:značka|číslo)?)\s*:?\s*'  # Volitelný prefix
     r')?'
@@ -691,7 +793,7 @@ LICENSE_PLATE_RE = re.compile(
 
 # VIN (Vehicle Identification Number) - 17 znaků
 # Formát: TMBCF61Z0L7654321, 1HGBH41JXMN109186
-VIN_RE = re.compile(
+VIN_RE = _compile_pii(
     r'(?:VIN|Vehicle\s+ID|Identifikační\s+číslo\s+vozidla)\s*[:\-]?\s*([A-HJ-NPR-Z0-9]{17})\b|'
     r'\b([A-HJ-NPR-Z0-9]{17})\b(?=\s*(?:VIN|vozidlo|auto|vehicle))',
     re.IGNORECASE
@@ -699,7 +801,7 @@ VIN_RE = re.compile(
 
 # MAC adresa (Media Access Control)
 # Formát: 00:1B:44:11:3A:B7, 00-1B-44-11-3A-B7, 001B.4411.3AB7
-MAC_RE = re.compile(
+MAC_RE = _compile_pii(
     r'(?:MAC\s+(?:address|adresa)?)\s*[:\-]?\s*([0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2})|'
     r'\b([0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2}[:\-][0-9A-F]{2})\b|'
     r'\b([0-9A-F]{4}\.[0-9A-F]{4}\.[0-9A-F]{4})\b',
@@ -708,38 +810,42 @@ MAC_RE = re.compile(
 
 # IMEI (International Mobile Equipment Identity)
 # Formát: 15 číslic (např. 123456789012345)
-IMEI_RE = re.compile(
+IMEI_RE = _compile_pii(
     r'(?:IMEI|International\s+Mobile\s+Equipment\s+Identity)\s*[:\-]?\s*(\d{15})\b|'
     r'\b(\d{15})\b(?=\s*(?:IMEI|mobil|telefon|mobile))',
     re.IGNORECASE
 )
 
 # IČO (8 číslic)
-ICO_RE = re.compile(
+ICO_RE = _compile_pii(
     r'(?:IČO?\s*:?\s*)?(?<!\d)(\d{8})(?!\d)',
     re.IGNORECASE
 )
 
 # DIČ (CZ + 8-10 číslic)
-DIC_RE = re.compile(
+DIC_RE = _compile_pii(
     r'\b(CZ\d{8,10})\b',
     re.IGNORECASE
 )
 
+# Negativní prefixy spisových značek (FÚ-xxx, KS-xxx, VS-xxx, čj-xxx) – všechny
+# mají 3 znaky, takže stačí jeden lookbehind s alternací místo čtyř za sebou
+_NOT_AFTER_FILE_REF = r'(?<!FÚ-|KS-|VS-|čj-)'
+
 # Rodné číslo (6 číslic / 3-4 číslice)
 # DŮLEŽITÉ: Musí mít SILNÝ kontext (RČ, Rodné číslo, nar.) - PRIORITA!
 # Regex má 2 capture groups - první pro context match, druhý pro standalone
-BIRTH_ID_RE = re.compile(
+BIRTH_ID_RE = _compile_pii(
     r'(?:'
-    r'(?:RČ|Rodné\s+číslo|r\.?\s?č\.?|nar\.|narozen[aáý]?|Narození)\s*:?\s*(\d{6}/?\d{3,4})|'  # S kontextem (CAPTURE GROUP 1)
-    r'(?<!FÚ-)(?<!KS-)(?<!VS-)(?<!čj-)(?<!\d)(\d{6}/\d{3,4})(?!\d)'  # Bez kontextu, ale ne po FÚ-/KS-/VS- (CAPTURE GROUP 2)
+    r'(?:RČ|Rodné\s+číslo|r\.?\s?č\.?|nar\.|narozen[aáý]?|Narození)(?:\s*:)?\s*(\d{6}/?\d{3,4})|'  # S kontextem (CAPTURE GROUP 1)
+    + _NOT_AFTER_FILE_REF + r'(?<!\d)(\d{6}/\d{3,4})(?!\d)'  # Bez kontextu, ale ne po FÚ-/KS-/VS- (CAPTURE GROUP 2)
     r')',
     re.IGNORECASE
 )
 
 # Číslo OP (formát: AB 123456 nebo OP: 123456789)
 # DŮLEŽITÉ: Musí být před PHONE_RE!
-ID_CARD_RE = re.compile(
+ID_CARD_RE = _compile_pii(
     r'(?:'
     r'\b([A-Z]{2}\s?\d{6})\b|'  # Standardní formát: AB 123456
     r'(?:OP|pas|pas\.|pas\.č\.|č\.OP)\s*[:\-]?\s*(\d{6,9})'  # OP: 123456789 nebo Pas: 123456
@@ -749,7 +855,9 @@ ID_CARD_RE = re.compile(
 
 # Email - OPRAVENO: Podpora pro diakritiku v lokální části
 # Zachytí: martina.horáková@neoteam.cz, jan.novák@firma.cz, atd.
-EMAIL_RE = re.compile(
+# Třída lokální části zůstává výčtem (ne \w) - \w by přidalo '_' a písmena
+# všech abeced; sre ji stejně kompiluje do jediné bitmapy
+EMAIL_RE = _compile_pii(
     r'\b([a-zA-ZáčďéěíňóřšťúůýžÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'
 )
 
@@ -757,11 +865,13 @@ EMAIL_RE = re.compile(
 # Prefix je mimo capture group, telefon je uvnitř
 # DŮLEŽITÉ: Whitelist - NEchytej biometrické/technické prefixy!
 # DŮLEŽITÉ: NEchytej částky (čísla následovaná Kč, EUR, USD)
-PHONE_RE = re.compile(
+# Oddělovač "(?:\s*:)?\s*" místo "\s*:?\s*" - dvě sousední \s* bez dvojtečky
+# vedly na dlouhých řadách mezer ke kubickému backtrackingu (stejné shody)
+PHONE_RE = _compile_pii(
     r'(?!'  # Negative lookahead - NEchytej pokud předchází:
     r'(?:IRIS_SCAN|VOICE_RK|HASH_BIO|FINGERPRINT|FACIAL_|RETINA_|PALM_|DNA_)_[A-Z0-9_]*'
     r')'
-    r'(?:tel\.?|telefon|mobil|GSM)?\s*:?\s*'  # Volitelný prefix (MIMO capture group!)
+    r'(?:tel\.?|telefon|mobil|GSM)?(?:\s*:)?\s*'  # Volitelný prefix (MIMO capture group!)
     r'('  # START capture group - jen samotné číslo
     r'\+420\s?\d{3}\s?\d{3}\s?\d{3}|'  # +420 xxx xxx xxx
     r'\+420\s?\d{3}\s?\d{2}\s?\d{2}\s?\d{2}|'  # +420 xxx xx xx xx
@@ -775,14 +885,14 @@ PHONE_RE = re.compile(
 # DŮLEŽITÉ: IBAN je samostatný regex níže!
 # NESMÍ zachytit spisové značky (FÚ-xxx/xxxx, KS-xxx/xxxx, VS-xxx)
 # DŮLEŽITÉ: Kód banky musí být součástí zachyceného účtu!
-BANK_RE = re.compile(
+BANK_RE = _compile_pii(
     r'(?:'
     # Standardní formát s předčíslím: 3622-1234567890/0710
-    r'(?<!FÚ-)(?<!KS-)(?<!VS-)(?<!čj-)(\d{1,6}-\d{6,16}/\d{4})|'
+    + _NOT_AFTER_FILE_REF + r'(\d{1,6}-\d{6,16}/\d{4})|'
     # Standardní formát: 123456/2010, 1234567890/3210
-    r'(?<!FÚ-)(?<!KS-)(?<!VS-)(?<!čj-)(\d{6,16}/\d{4})|'
+    + _NOT_AFTER_FILE_REF + r'(\d{6,16}/\d{4})|'
     # S kontextem: "číslo účtu: 123456789/0800" - zachytí i s kódem pokud je
-    r'(?:číslo\s+účtu|účet|účtu|platba\s+na\s+účet|bankovní\s+účet)\s*:?\s*(\d{6,16}(?:/\d{4})?)'
+    r'(?:číslo\s+účtu|účet|účtu|platba\s+na\s+účet|bankovní\s+účet)(?:\s*:)?\s*(\d{6,16}(?:/\d{4})?)'
     r')\b',
     re.IGNORECASE
 )
@@ -790,75 +900,75 @@ BANK_RE = re.compile(
 # IBAN (mezinárodní formát bankovního účtu)
 # CZ IBAN: CZ + 2 číslice + 20 číslic = 24 znaků celkem
 # KRITICKÉ: Musí být před CARD_RE, protože obsahuje dlouhé sekvence číslic!
-IBAN_RE = re.compile(
+IBAN_RE = _compile_pii(
     r'\b(CZ\d{2}(?:\s?\d{4}){5})\b',
     re.IGNORECASE
 )
 
 # Datum (DD.MM.YYYY nebo DD. MM. YYYY)
 # Obecný pattern pro všechna data
-DATE_RE = re.compile(
+DATE_RE = _compile_pii(
     r'\b(\d{1,2}\.\s?\d{1,2}\.\s?\d{4})\b'
 )
 
 # Datum narození (DOB) - specificky pro "Datum narození:" kontext
-DOB_RE = re.compile(
+DOB_RE = _compile_pii(
     r'(?:Datum\s+narození|Narozen[aý]?|Nar\.|Narození)\s*:?\s*(\d{1,2}\.\s?\d{1,2}\.\s?\d{4})\b',
     re.IGNORECASE
 )
 
 # Datum slovně (např. "15. března 2024")
-DATE_WORDS_RE = re.compile(
+DATE_WORDS_RE = _compile_pii(
     r'\b(\d{1,2}\.\s?(?:ledna|února|března|dubna|května|června|července|srpna|září|října|listopadu|prosince)\s?\d{4})\b',
     re.IGNORECASE
 )
 
 # Hesla a credentials (KRITICKÉ - hodnotu neukládat!)
-PASSWORD_RE = re.compile(
+PASSWORD_RE = _compile_pii(
     r'(?:password|heslo|passwd|pwd|pass)\s*[:\-=]\s*([^\s,;\.]{3,50})',
     re.IGNORECASE
 )
 
 # Credentials pattern - "Credentials: username / password"
-CREDENTIALS_RE = re.compile(
+CREDENTIALS_RE = _compile_pii(
     r'(?i)\b(credentials?|login|přihlašovací\s+údaje)\s*:\s*([A-Za-z0-9._\-@]+)\s*/\s*(\S+)',
     re.IGNORECASE
 )
 
 # API klíče, Secrets, Tokens (KRITICKÉ - hodnotu neukládat!)
-API_KEY_RE = re.compile(
+API_KEY_RE = _compile_pii(
     r'(?:AWS\s+)?(?:Access\s+)?(?:Key(?:\s+ID)?|Secret(?:\s+Access\s+Key)?|Token|API[_\s]?Key)\s*[:\-=]\s*([A-Za-z0-9+/=_\-]{16,})',
     re.IGNORECASE
 )
 
-SECRET_RE = re.compile(
+SECRET_RE = _compile_pii(
     r'(?:Stripe|SendGrid|GitHub|Secret|Client[_\s]?Secret|Access\s+Token|Personal\s+Access\s+Token)\s*[:\-=]\s*([A-Za-z0-9+/=_\-]{16,})',
     re.IGNORECASE
 )
 
-SSH_KEY_RE = re.compile(
+SSH_KEY_RE = _compile_pii(
     r'(?:ssh-rsa|ssh-ed25519|ecdsa-sha2-nistp256)\s+([A-Za-z0-9+/=]{50,})',
     re.IGNORECASE
 )
 
 # Usernames, Account IDs, Hostnames
-USERNAME_RE = re.compile(
+USERNAME_RE = _compile_pii(
     r'(?:Login|Username|Uživatel|User|GitHub|Jira|AWS\s+Console)\s*[:\-=]\s*([A-Za-z0-9._\-@]+)',
     re.IGNORECASE
 )
 
-ACCOUNT_ID_RE = re.compile(
+ACCOUNT_ID_RE = _compile_pii(
     r'(?:Account\s+ID|AWS\s+Account)\s*[:\-=]\s*(\d{12})',
     re.IGNORECASE
 )
 
-HOSTNAME_RE = re.compile(
+HOSTNAME_RE = _compile_pii(
     r'(?:hostname|host|server|RDS|endpoint)\s*[:\-=]\s*([a-z0-9\-\.]+\.[a-z]{2,})',
     re.IGNORECASE
 )
 
 # IP adresy (IPv4)
-IP_RE = re.compile(
+IP_RE = _compile_pii(
     r'\b(?<!\d\.)(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?!\.\d)\b'
 )
 
@@ -866,7 +976,7 @@ IP_RE = re.compile(
 # Rozšířený pattern: Visa/MC (16), AmEx (15), Diners (14), atd.
 # DŮLEŽITÉ: IBAN se zpracovává PŘED tímto regexem!
 # DŮLEŽITÉ: Zachytí i "Číslo:" když je to 16-19 číslic (typicky karta)
-CARD_RE = re.compile(
+CARD_RE = _compile_pii(
     r'(?:'
     # S prefixem: "Číslo karty:", "Karta:", "Card Number:", "Číslo:" (když 16 číslic)
     r'(?:Číslo\s+(?:platební\s+)?karty|Číslo|(?:Platební\s+)?(?:Karta|Card)(?:\s+\d+)?(?:\s+Number)?)\s*[:\-=]?\s*'
@@ -880,13 +990,13 @@ CARD_RE = re.compile(
 )
 
 # Čísla pojištěnce
-INSURANCE_ID_RE = re.compile(
+INSURANCE_ID_RE = _compile_pii(
     r'(?:Číslo\s+pojištěnce|Pojišťovna|VZP|ČPZP|ZPŠ|OZP)[,\s:]+(?:číslo\s*:?\s*)?(\d{10})',
     re.IGNORECASE
 )
 
 # RFID/Badge čísla
-RFID_RE = re.compile(
+RFID_RE = _compile_pii(
     r'(?:RFID\s+karta|badge|ID\s+karta)\s*[:#]?\s*([A-Za-z0-9\-_/]+)',
     re.IGNORECASE
 )
@@ -894,27 +1004,27 @@ RFID_RE = re.compile(
 # ========== SOCIAL MEDIA (KRITICKÉ - PII) ==========
 
 # LinkedIn profily
-LINKEDIN_RE = re.compile(
+LINKEDIN_RE = _compile_pii(
     r'(?:LinkedIn|linkedin)?\s*:?\s*(https?://(?:www\.)?linkedin\.com/in/[A-Za-z0-9\-_]+)',
     re.IGNORECASE
 )
 
 # Facebook profily
-FACEBOOK_RE = re.compile(
+FACEBOOK_RE = _compile_pii(
     r'(?:Facebook|facebook)?\s*:?\s*(https?://(?:www\.)?facebook\.com/[A-Za-z0-9\._\-]+)',
     re.IGNORECASE
 )
 
 # Instagram handle - POUZE s explicitním kontextem nebo URL
 # NEchytej @ z emailů!
-INSTAGRAM_RE = re.compile(
+INSTAGRAM_RE = _compile_pii(
     r'(?:Instagram|instagram)\s*:?\s*(@[A-Za-z0-9_]+)|'  # Handle pouze s prefixem "Instagram:"
     r'(https?://(?:www\.)?instagram\.com/[A-Za-z0-9_\.]+)',  # Nebo plné URL
     re.IGNORECASE
 )
 
 # Skype ID
-SKYPE_RE = re.compile(
+SKYPE_RE = _compile_pii(
     r'(?:Skype|skype)\s*:?\s*([A-Za-z0-9\._\-]+)',
     re.IGNORECASE
 )
@@ -922,20 +1032,20 @@ SKYPE_RE = re.compile(
 # ========== BIOMETRIC IDs (KRITICKÉ - GDPR Článek 9) ==========
 
 # Voice ID / Hlasový profil
-VOICE_ID_RE = re.compile(
+VOICE_ID_RE = _compile_pii(
     r'(?:Hlasový\s+profil|Voice\s+ID|VOICE_ID|Voice\s+Profile)\s*[:\-=]?\s*([A-Z0-9_\-]+)',
     re.IGNORECASE
 )
 
 # Biometric hash (otisk prstu, sítnice, atd.)
 # Zachytí pouze hodnoty po explicitním "hash:", "Hash:", nebo samostatné hash kódy
-BIO_HASH_RE = re.compile(
+BIO_HASH_RE = _compile_pii(
     r'(?:hash|Hash):\s*([A-Z][A-Z0-9_\-]{10,})|'  # hash: HASH_BIO_JP_2024_0156
     r'\b((?:HASH_BIO|IRIS|RETINA|FINGERPRINT|PALM|DNA)_[A-Z0-9_\-]{8,})\b'  # Standalone hash codes
 )
 
 # Photo ID / Face ID files
-PHOTO_ID_RE = re.compile(
+PHOTO_ID_RE = _compile_pii(
     r'(photo_id_[A-Za-z0-9_\-]+\.(?:jpg|jpeg|png|gif|bmp))|'
     r'(face_id_[A-Za-z0-9_\-]+\.(?:jpg|jpeg|png|gif|bmp))|'
     r'(?:Fotografie|Photo\s+ID|Face\s+ID)\s*[:\-=]?\s*[Uu]loženo.*?\(([A-Za-z0-9_\-]+\.(?:jpg|jpeg|png|gif|bmp))\)',
@@ -943,14 +1053,14 @@ PHOTO_ID_RE = re.compile(
 )
 
 # Enhanced API Key - zachytí i složitější formáty
-API_KEY_ENHANCED_RE = re.compile(
+API_KEY_ENHANCED_RE = _compile_pii(
     r'(?:API\s+klíč|API\s+Key|api_key)\s*[:\-=]?\s*([A-Za-z0-9_\-]+)',
     re.IGNORECASE
 )
 
 # Genetické identifikátory (rs...) - NESMÍ být zachyceny jako ICO!
 # Pattern: rs28897696, rs1234567
-GENETIC_ID_RE = re.compile(
+GENETIC_ID_RE = _compile_pii(
     r'\b(rs\d{6,})\b',
     re.IGNORECASE
 )
@@ -960,7 +1070,7 @@ GENETIC_ID_RE = re.compile(
 # Datum narození (samostatné, ne v rodném čísle)
 # Formáty: dd.mm.yyyy, dd/mm/yyyy, dd-mm-yyyy
 # S kontextem: "datum narození:", "nar.", "narozen(a)"
-BIRTH_DATE_RE = re.compile(
+BIRTH_DATE_RE = _compile_pii(
     r'(?:datum\s+narození|nar\.|narozen[aáý]?)\s*[:\-]?\s*'
     r'(\d{1,2}[\./\-]\d{1,2}[\./\-]\d{4})',
     re.IGNORECASE
@@ -968,14 +1078,14 @@ BIRTH_DATE_RE = re.compile(
 
 # Číslo pasu
 # Formáty: 12345678 (8 číslic), AB123456 (2 písmena + 6 číslic)
-PASSPORT_RE = re.compile(
+PASSPORT_RE = _compile_pii(
     r'(?:pas|passport|č\.\s*pasu)\s*(?:č\.)?\s*[:\-]?\s*([A-Z]{0,2}\d{6,9})\b',
     re.IGNORECASE
 )
 
 # Číslo řidičského průkazu
 # Formáty: AB123456, 12345678
-DRIVER_LICENSE_RE = re.compile(
+DRIVER_LICENSE_RE = _compile_pii(
     r'(?:ŘP|řidičák|řidičský\s+průkaz|driver\'?s?\s*license)\s*(?:č\.)?\s*[:\-]?\s*([A-Z]{0,2}\d{6,9})\b',
     re.IGNORECASE
 )
@@ -983,7 +1093,7 @@ DRIVER_LICENSE_RE = re.compile(
 # Benefitní karty (MultiSport, Sodexo, Edenred, atd.) - DŮLEŽITÉ PII!
 # Formáty: 9876543210, MS-123456, SOD/123456, "ID karty: 9876543210"
 # Důvod přidání: Unikátní identifikátor osoby, jednoznačně PII
-BENEFIT_CARD_RE = re.compile(
+BENEFIT_CARD_RE = _compile_pii(
     r'(?:'
     r'(?:MultiSport|Sodexo|Edenred|benefitní\s+karta|benefit\s+card)\s*(?:karta|č\.?|ID)?\s*[:\-]?\s*([A-Z]{0,3}[\-/]?\d{6,12})|'
     r'ID\s+karty\s*[:\-]\s*(\d{6,12})'
@@ -991,18 +1101,327 @@ BENEFIT_CARD_RE = re.compile(
     re.IGNORECASE
 )
 
+# Slova prozrazující firmu, produkt nebo instituci (ne PERSON) – jeden vzor
+# místo jedenácti samostatných re.search nad stejným textem
+NON_PERSON_RE = re.compile(
+    r'\b(?:'
+    # Tech/Software
+    r'tech|cloud|web|solutions?|data|digital|software|analytics|'
+    r'team|hub|enterprise|premium|standard|professional|'
+    r'google|amazon|microsoft|apple|facebook|splunk|cisco|'
+    r'repository|authenticator|vision|protection|security|'
+    # Finance/Investment
+    r'capital|equity|value|investment|fund|holdings|assets|'
+    r'crescendo|ventures|partners|portfolio|'
+    # Management/Business
+    r'management|processing|executive|legal|counsel|'
+    r'clinic|series|launch|innovate|healthcare|'
+    # Products/Medical
+    r'symbicort|turbuhaler|spirometr|jaeger|'
+    r'pharma|pharmaceutical|medical|'
+    # Company suffixes když jsou uprostřed
+    r'group|company|corp|ltd|gmbh|inc|services?'
+    r')\b'
+)
+
+# Typické koncovky českých příjmení
+_VALID_SURNAME_SUFFIXES = frozenset({
+    'ová', 'á',  # ženské
+    'ek', 'ák', 'ík', 'ský', 'cký', 'čák', 'ec', 'el',  # mužské
+    'a',  # Svoboda, Skála, Liška
+    'ý', 'í',  # přídavná jména
+    # Další běžné koncovky
+    'an', 'en', 'in', 'on', 'un',  # Urban, Marin, Kubín, atd.
+    'eš', 'iš', 'uš', 'áš', 'íš',  # Beneš, Kříž, Lukáš, atd.
+    'or', 'ar', 'ir', 'ur',  # Gregor, Kohár, atd.
+    'ov', 'ev', 'av', 'iv',  # Petrov, Medveděv, atd.
+    'áč', 'ič', 'oč', 'ůč',  # Horváč, Novič, atd.
+    'át', 'ůt', 'ut', 'et'   # Sovát, Kůt, atd.
+})
+_VALID_SURNAME_SUFFIX_LENS = tuple(sorted({len(suf) for suf in _VALID_SURNAME_SUFFIXES}))
+
+def has_valid_surname_suffix(lo: str) -> bool:
+    """Končí (lowercase) příjmení typickou českou koncovkou?
+
+    Jeden řez a dotaz do množiny pro každou délku koncovky (1–3 znaky)
+    místo porovnání se všemi ~40 koncovkami přes str.endswith().
+    """
+    return any(lo[-k:] in _VALID_SURNAME_SUFFIXES for k in _VALID_SURNAME_SUFFIX_LENS)
+
+# =============== Vzory pro detekci osob ===============
+# Kompilují se jednou při importu (ne při každém volání _replace_remaining_people)
+
+# Rodné příjmení: (rozená Novotná), (dříve Svobodová), (roz. Malá)
+_MAIDEN_NAME_RE = re.compile(
+    r'\((rozená|rozenou|roz\.|dříve|dřív|původně)\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\)',
+    re.UNICODE | re.IGNORECASE
+)
+
+# Samostatné příjmení s kontextem: "pan Novák", "paní Malá", "Novák uvedl", "Novákovi bylo"
+_STANDALONE_SURNAME_RE = re.compile(
+    r'(?:'
+    r'(?:pan|paní|pana|paní|panu)\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)|'  # pan Novák
+    r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+ov[ia])\s+(?:uvedl|uvedla|řekl|řekla|byl|byla|měl|měla)|'  # Novákovi uvedl
+    r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+(?:uvedl|uvedla|řekl|řekla|potvrdil|potvrdila)'  # Novák uvedl
+    r')',
+    re.UNICODE | re.IGNORECASE
+)
+
+# Samostatné křestní jméno následované slovesem nebo "jako" (i po uvozovkách)
+_STANDALONE_FIRST_NAME_RE = re.compile(
+    r'(?:^|["\s])([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+(?:pracoval|pracovala|řekl|řekla|uvedl|uvedla|jako|byl|byla|je|jsou|měl|měla|dělal|dělala)',
+    re.UNICODE | re.MULTILINE
+)
+
+# Jméno s titulem (MUDr. Eva Malá)
+_TITLED_PERSON_RE = re.compile(
+    r'(Ing\.|Mgr\.|Bc\.|MUDr\.|JUDr\.|PhDr\.|RNDr\.|Prof\.|Doc\.|Ph\.D\.|MBA|CSc\.|DrSc\.)\s+'
+    r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+'
+    r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)',
+    re.UNICODE
+)
+
+# Jméno příjmení
+_PERSON_NAME_RE = re.compile(
+    r'\b([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)'
+    r'\s+'
+    r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\b',
+    re.UNICODE
+)
+
+# Právní forma hned za jménem ("Novák s.r.o.") → název firmy, ne osoba
+_COMPANY_FORM_AFTER_RE = re.compile(r'^\s*(s\.r\.o\.|a\.s\.|spol\.|k\.s\.|v\.o\.s\.|ltd\.?|inc\.?)', re.IGNORECASE)
+
+# =============== Slovníky pro validaci osob ===============
+# Sdílené konstanty – nestaví se znovu při každé shodě jména
+
+# Slova, která vypadají jako samostatná křestní jména, ale nejsou
+_STANDALONE_IGNORE_WORDS = frozenset({
+    'praha', 'brno', 'ostrava', 'plzeň', 'česká', 'slovenská',
+    'evropa', 'amerika', 'asie', 'afrika', 'čech', 'moravia'
+})
+
+# Blacklist kritických slov pro jména s titulem (podřetězce)
+_TITLED_CRITICAL_BLACKLIST = frozenset({
+    's.r.o.', 'a.s.', 'spol.', 'k.s.', 'v.o.s.', 'o.p.s.',
+    'ltd', 'inc', 'corp', 'gmbh', 'llc',
+    'czech', 'republic', 'synlab', 'gymnázium', 'gymnasium',
+    'university', 'univerzita', 'fakulta', 'klinika', 'nemocnice',
+    'centrum', 'ústav', 'institute', 'academy', 'akademie',
+    'kaspersky', 'endpoint', 'latitude', 'archer', 'classic',
+    'windows', 'linux', 'android', 'ios', 'office', 'excel',
+    'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
+    'manager', 'director', 'chief', 'officer',
+    'vyšetřující', 'vyšetřovatel', 'lékař', 'doktor', 'sestra'
+})
+
+# Blacklist kritických slov (firmy, instituce, produkty, role) – podřetězce;
+# stejný jako u jmen s titulem + nemocnice (Motol, Bulovka, Thomayer) a 'center'
+_PERSON_CRITICAL_BLACKLIST = _TITLED_CRITICAL_BLACKLIST | {
+    'motol', 'bulovka', 'thomayer', 'center',
+}
+
+# Rozšířený ignore list (celé tokeny)
+_PERSON_IGNORE_WORDS = frozenset({
+    # Běžná slova ve smlouvách
+    'místo', 'datum', 'částku', 'bytem', 'sídlo', 'adresa',
+    'číslo', 'kontakt', 'telefon', 'email', 'rodné', 'narozena',
+    'vydán', 'uzavřena', 'podepsána', 'smlouva', 'dohoda',
+    # Místa
+    'staré', 'město', 'nové', 'malá', 'strana',
+    'václavské', 'náměstí', 'hlavní', 'nádraží',
+    # Organizace/instituce klíčová slova
+    'česká', 'spořitelna', 'komerční', 'banka', 'raiffeisen',
+    'credit', 'bank', 'financial', 'global', 'senior',
+    'junior', 'lead', 'chief', 'head', 'director',
+    # Finance/Investment
+    'capital', 'equity', 'value', 'crescendo', 'investment',
+    'fund', 'holdings', 'partners', 'assets', 'portfolio',
+    # Pozice/role
+    'jednatel', 'jednatelka', 'ředitel', 'ředitelka',
+    'auditor', 'manager', 'consultant', 'specialist',
+    'assistant', 'coordinator', 'analyst', 'pacient',
+    'scrum', 'master', 'developer', 'architect', 'engineer',
+    'officer', 'professional', 'certified', 'advanced',
+    'management', 'legal', 'counsel', 'executive',
+    # Pozdravy/oslovení
+    'ahoj', 'dobrý', 'den', 'vážený', 'vážená',
+    # Značky aut
+    'škoda', 'octavia', 'fabia', 'superb', 'kodiaq',
+    'volkswagen', 'toyota', 'ford', 'bmw', 'audi',
+    # Technologie a software
+    'google', 'amazon', 'microsoft', 'apple', 'facebook',
+    'cloud', 'web', 'tech', 'solutions', 'data', 'digital',
+    'software', 'enterprise', 'premium', 'standard',
+    'analytics', 'computer', 'vision', 'protection',
+    'security', 'authenticator', 'repository', 'access',
+    'personal', 'hub', 'book', 'pro', 'series', 'launch',
+    'team', 'development', 'react', 'splunk', 'innovate',
+    'ventures', 'credo', 'mayo', 'clinic', 'met', 'london',
+    'avenue', 'contractual', 'plánovaná', 'diagno',
+    'cisco', 'processing', 'notářská',
+    # Zdravotnictví + Léky/Produkty
+    'nemocnice', 'poliklinika', 'polikliniek', 'nemocniec',
+    'healthcare', 'symbicort', 'turbuhaler', 'spirometr',
+    'jaeger', 'medical', 'health', 'pharma', 'pharmaceutical',
+    # Další
+    'care', 'plus', 'minus', 'service', 'services',
+    'group', 'company', 'corp', 'ltd', 'gmbh', 'inc'
+})
+
+# Role na místě křestního jména ("Ředitelka Centrum")
+_PERSON_ROLE_WORDS = frozenset({
+    'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
+    'manager', 'director', 'chief', 'officer',
+    'specialist', 'consultant', 'coordinator',
+    'developer', 'architect', 'engineer', 'analyst'
+})
+
+# Role na místě křestního jména u jmen s titulem – navíc vyšetřovatelé a lékaři
+_TITLED_ROLE_WORDS = _PERSON_ROLE_WORDS | {
+    'vyšetřující', 'vyšetřovatel', 'lékař', 'doktor',
+}
+
+# Krátká anglická slova na místě příjmení ("Met London", "Hub Team") → firma/produkt
+_PRODUCT_SHORT_WORDS = frozenset({'hub', 'pro', 'met', 'net', 'web', 'app', 'lab', 'dev'})
+
+# Whitelist běžných českých jmen (nejsou v knihovně, ale jsou validní)
+_COMMON_CZECH_NAMES = frozenset({'jan', 'petr', 'pavel', 'jiří', 'josef', 'tomáš', 'martin', 'jakub', 'david', 'daniel'})
+
+# Příznaky slova v jednom slovníku – jeden lookup místo několika testů členství
+_W_IGNORE = 1        # _PERSON_IGNORE_WORDS
+_W_ROLE = 2          # _PERSON_ROLE_WORDS
+_W_TITLED_ROLE = 4   # _TITLED_ROLE_WORDS
+_W_COMMON_NAME = 8   # _COMMON_CZECH_NAMES
+
+def _build_person_word_flags() -> Dict[str, int]:
+    flags = {}
+    for words, flag in ((_PERSON_IGNORE_WORDS, _W_IGNORE),
+                        (_PERSON_ROLE_WORDS, _W_ROLE),
+                        (_TITLED_ROLE_WORDS, _W_TITLED_ROLE),
+                        (_COMMON_CZECH_NAMES, _W_COMMON_NAME)):
+        for w in words:
+            flags[w] = flags.get(w, 0) | flag
+    return flags
+
+_PERSON_WORD_FLAGS = _build_person_word_flags()
+
+# Podřetězcové blacklisty jako jedna alternace – jeden průchod místo smyčky přes slova.
+# Testovaný řetězec je "jméno příjmení" složený jen z písmen, položky s tečkou
+# (s.r.o., a.s., …) v něm nikdy nenajdou shodu – do alternace se nedávají
+# (právní formu za jménem hlídá _COMPANY_FORM_AFTER_RE)
+def _substring_any_re(words):
+    return re.compile('|'.join(map(re.escape, sorted(w for w in words if w.isalpha()))))
+
+_TITLED_CRITICAL_BLACKLIST_RE = _substring_any_re(_TITLED_CRITICAL_BLACKLIST)
+_PERSON_CRITICAL_BLACKLIST_RE = _substring_any_re(_PERSON_CRITICAL_BLACKLIST)
+
+# Vzory osob závisí jen na nominativu jména a příjmení – kompilují se jednou
+# na proces a sdílí se napříč dokumenty (instancemi Anonymizeru)
+@lru_cache(maxsize=4096)
+def compile_person_patterns(first_nom: str, last_nom: str) -> Tuple[Tuple[str, ...], 're.Pattern', Optional['re.Pattern']]:
+    """Vrátí (varianty, předfiltr, regex variant) pro osobu.
+
+    Předfiltr je alternace bez hranic slov – když nenajde nic, nemůže uspět
+    ani žádná jednotlivá varianta. Regex variant skládá povolené varianty
+    do jedné alternace (od nejdelší); zkrácené genitivy se odfiltrují tady.
+    """
+    fvars = variants_for_first(first_nom)
+    svars = variants_for_surname(last_nom)
+    # Varianty seřazené od nejdelší (pořadí alternace v regexu variant)
+    variants = tuple(sorted({f'{f} {s}' for f in fvars for s in svars}, key=len, reverse=True))
+    probe = re.compile(
+        '(?:' + '|'.join(map(re.escape, fvars)) + ') (?:' + '|'.join(map(re.escape, svars)) + ')',
+        re.IGNORECASE
+    )
+
+    allowed = []
+    for pat in variants:
+        # FILTR: Odmítni zkrácené genitivy
+        parts = pat.split()
+        if len(parts) == 2:
+            fv, lv = parts
+            fv_lo = fv.lower()
+
+            # Pokud křestní jméno má 3-5 znaků a končí na 'k' → zkrácený genitiv
+            if 3 <= len(fv) <= 5 and fv_lo[-1] == 'k':
+                continue
+
+            # Pokud křestní jméno má 3 znaky a nekončí na samohlásku/n/l/r → zkrácený
+            if len(fv) == 3 and fv_lo[-1] not in _SHORT_NAME_FINALS:
+                continue
+
+        allowed.append(re.escape(pat))
+
+    rx = None
+    if allowed:
+        rx = re.compile(r'(?<!\w)(?:' + '|'.join(allowed) + r')(?!\w)', re.IGNORECASE)
+    return variants, probe, rx
+
+# Překladová tabulka pro normalize_for_matching: znak -> ASCII písmena bez
+# diakritiky (lowercase), ostatní znaky -> None. Rozklad NFD jednotlivých znaků
+# dává totéž co rozklad celého řetězce (kombinující znaky se zahazují), proto
+# stačí jeden str.translate. Znaky mimo Latin-1/Latin Extended-A se doplní při
+# prvním výskytu.
+class _NameNormalizeTable(dict):
+    def __init__(self, prefill: int = 0x180):
+        super().__init__()
+        # Předvyplnění Latin-1 + Latin Extended-A (každý přístup zavolá __missing__)
+        for code in range(prefill):
+            self[code]
+
+    def __missing__(self, code: int):
+        n = unicodedata.normalize('NFD', chr(code))
+        kept = ''.join(c for c in n if c.isascii() and c.isalpha()).lower()
+        self[code] = kept or None
+        return self[code]
+
+_NAME_NORMALIZE_TABLE = _NameNormalizeTable()
+
+# Stejná jména (Jan, Petr, Nováková…) se normalizují opakovaně – výsledek se cachuje
+@lru_cache(maxsize=16384)
+def normalize_for_matching(text: str) -> str:
+    """Normalizuje text pro porovnávání (odstranění diakritiky, lowercase)."""
+    if not text: return ""
+    return text.translate(_NAME_NORMALIZE_TABLE)
+
 # =============== Třída Anonymizer ===============
 class Anonymizer:
-    def __init__(self, verbose=False):
-        self.verbose = verbose
-        self.counter = defaultdict(int)
-        self.canonical_persons = []  # list of {first, last, tag}
-        self.person_index = {}  # (first_norm, last_norm) -> tag
-        self.person_variants = {}  # tag -> set of all variants
-        self.entity_map = defaultdict(lambda: defaultdict(set))  # typ -> original -> varianty
-        self.entity_index_cache = defaultdict(dict)  # OPTIMIZATION: typ -> original -> idx cache
-        self.entity_reverse_map = defaultdict(dict)  # OPTIMIZATION: typ -> variant -> original
-        self.source_text = ""  # Store original text for validation
+    def __init__(self, verbose: bool = False):
+        self.verbose: bool = verbose
+        self.counter: Dict[str, int] = defaultdict(int)
+        self.canonical_persons: List[Dict[str, str]] = []  # list of {first, last, tag}
+        self.person_index: Dict[Tuple[str, str], str] = {}  # (first_norm, last_norm) -> tag
+        self._person_tags: Dict[Tuple[str, str], str] = {}  # (first_nom, last_nom) -> tag, bez normalizace
+        self.person_variants: Dict[str, Tuple[str, ...]] = {}  # tag -> tuple of all variants (od nejdelší)
+        self.person_probes: Dict[str, 're.Pattern'] = {}  # tag -> regex "libovolná varianta jména + příjmení" (předfiltr)
+        self.person_variants_rx: Dict[str, Optional['re.Pattern']] = {}  # tag -> jeden regex se všemi povolenými variantami
+        # Entity po sloupcích: typ -> {'origs': [original], 'rev': {varianta: idx}, 'vars': [set variant]}
+        # (idx je pořadí od 0, štítek je [[TYP_idx+1]])
+        self._ents: Dict[str, dict] = {}
+        self.source_text: str = ""  # Store original text for validation
+
+    @property
+    def entity_map(self) -> Dict[str, Dict[str, Set[str]]]:
+        """Pohled typ -> original -> varianty (v pořadí štítků) pro výstupy."""
+        return {typ: self.get_entities_by_type(typ) for typ in self._ents}
+
+    def get_entities_by_type(self, typ: str) -> Dict[str, Set[str]]:
+        """Entity jednoho typu: original -> varianty (v pořadí štítků).
+
+        Skládá jen sloupce daného typu – bez sestavení celé entity_map.
+        """
+        e = self._ents.get(typ)
+        if e is None:
+            return {}
+        return dict(zip(e['origs'], e['vars']))
+
+    def _entity_slot(self, typ: str) -> dict:
+        """Vrátí (případně založí) sloupce entit daného typu."""
+        e = self._ents.get(typ)
+        if e is None:
+            e = self._ents[typ] = {'origs': [], 'rev': {}, 'vars': []}
+        return e
 
     def _get_or_create_label(self, typ: str, original: str, store_value: bool = True) -> str:
         """Vrátí existující nebo vytvoří nový štítek pro entitu.
@@ -1017,17 +1436,16 @@ class Anonymizer:
 
         # Speciální cleanup pro ADDRESS - odstraň prefixy "Sídlo:", "Trvalé bydliště:", "Trvalý pobyt:" atd.
         if typ == 'ADDRESS':
-            orig_norm = re.sub(r'^(Sídlo|Trvalé\s+bydliště|Trvalý\s+pobyt|Bydliště|Adresa|Místo\s+podnikání|Se\s+sídlem|Bytem)\s*:\s*', '', orig_norm, flags=re.IGNORECASE)
+            orig_norm = _ADDRESS_LABEL_PREFIX_RE.sub('', orig_norm, count=1)
 
-        # OPTIMIZATION: Use reverse_map for O(1) lookup instead of O(n) iteration
-        # Check if this variant already exists
-        if orig_norm in self.entity_reverse_map[typ]:
-            existing_orig = self.entity_reverse_map[typ][orig_norm]
-            existing_idx = self.entity_index_cache[typ][existing_orig]
-            return f"[[{typ}_{existing_idx}]]"
+        # Existující varianta → jeden dotaz do reverzního indexu
+        e = self._entity_slot(typ)
+        existing_idx = e['rev'].get(orig_norm)
+        if existing_idx is not None:
+            return f"[[{typ}_{existing_idx + 1}]]"
 
         # Vytvoř nový
-        idx = len(self.entity_map[typ]) + 1
+        idx = len(e['origs']) + 1
 
         # Pro citlivá data: unikátní placeholder pro každý item
         # Pro běžná data: ukládej skutečnou hodnotu
@@ -1037,24 +1455,24 @@ class Anonymizer:
             # Každý citlivý item má unikátní klíč, ale zobrazí se jako ***REDACTED***
             map_key = f"***REDACTED_{idx}***"
 
-        self.entity_map[typ][map_key].add(orig_norm)
-        self.entity_index_cache[typ][map_key] = idx  # Cache the index
-        self.entity_reverse_map[typ][orig_norm] = map_key  # Reverse lookup
+        e['origs'].append(map_key)
+        e['vars'].append({orig_norm})
+        e['rev'][orig_norm] = idx - 1  # Reverse lookup
         return f"[[{typ}_{idx}]]"
 
-    def _normalize_for_matching(self, text: str) -> str:
-        """Normalizuje text pro porovnávání (odstranění diakritiky, lowercase)."""
-        if not text: return ""
-        n = unicodedata.normalize('NFD', text)
-        no_diac = ''.join(c for c in n if not unicodedata.combining(c))
-        return re.sub(r'[^A-Za-z]', '', no_diac).lower()
-
     def _ensure_person_tag(self, first_nom: str, last_nom: str) -> str:
         """Zajistí, že pro danou osobu existuje tag a vrátí ho."""
-        key = (self._normalize_for_matching(first_nom), self._normalize_for_matching(last_nom))
+        # Stejná osoba se v dokumentu zmiňuje opakovaně – přímý dotaz bez normalizace
+        raw_key = (first_nom, last_nom)
+        tag = self._person_tags.get(raw_key)
+        if tag is not None:
+            return tag
+
+        key = (normalize_for_matching(first_nom), normalize_for_matching(last_nom))
 
         if key in self.person_index:
-            return self.person_index[key]
+            tag = self._person_tags[raw_key] = self.person_index[key]
+            return tag
 
         # Vytvoř nový tag
         self.counter['PERSON'] += 1
@@ -1062,53 +1480,48 @@ class Anonymizer:
 
         # Ulož do indexu
         self.person_index[key] = tag
+        self._person_tags[raw_key] = tag
         self.canonical_persons.append({'first': first_nom, 'last': last_nom, 'tag': tag})
 
-        # Vygeneruj všechny pádové varianty
-        fvars = variants_for_first(first_nom)
-        svars = variants_for_surname(last_nom)
-        self.person_variants[tag] = {f'{f} {s}' for f in fvars for s in svars}
+        # Vygeneruj všechny pádové varianty (+ předfiltr a regex variant, sdílené přes cache)
+        variants, probe, rx = compile_person_patterns(first_nom, last_nom)
+        self.person_variants[tag] = variants
+        self.person_probes[tag] = probe
+        self.person_variants_rx[tag] = rx
 
         # Ulož kanonickou formu do entity_map
-        canonical_full = f'{first_nom} {last_nom}'
-        self.entity_map['PERSON'][canonical_full].add(canonical_full)
-        self.entity_index_cache['PERSON'][canonical_full] = self.counter['PERSON']
-        self.entity_reverse_map['PERSON'][canonical_full] = canonical_full
+        canonical_full = sys.intern(f'{first_nom} {last_nom}')
+        e = self._entity_slot('PERSON')
+        e['origs'].append(canonical_full)
+        e['vars'].append({canonical_full})
+        e['rev'][canonical_full] = self.counter['PERSON'] - 1
 
         return tag
 
     def _apply_known_people(self, text: str) -> str:
         """Aplikuje známé osoby (již detekované) - nahrazuje všechny pádové varianty stejným tagem."""
         # FÁZE 1: Nahrazení plných jmen (křestní + příjmení)
+        persons = self._ents.get('PERSON')
         for p in self.canonical_persons:
             tag = p['tag']
 
-            # Pro každou variantu této osoby (seřazeno od nejdelší)
-            for pat in sorted(self.person_variants[tag], key=len, reverse=True):
-                # FILTR: Odmítni zkrácené genitivy
-                parts = pat.split()
-                if len(parts) == 2:
-                    fv, lv = parts
-                    fv_lo = fv.lower()
-
-                    # Pokud křestní jméno má 3-5 znaků a končí na 'k' → zkrácený genitiv
-                    if 3 <= len(fv) <= 5 and fv_lo[-1] == 'k':
-                        continue
+            # Předfiltr: jediný průchod textem pro celou osobu (stovky variant)
+            if not self.person_probes[tag].search(text):
+                continue
 
-                    # Pokud křestní jméno má 3 znaky a nekončí na samohlásku/n/l/r → zkrácený
-                    if len(fv) == 3 and not fv_lo[-1] in 'aeiouyáéíóúůýnlr':
-                        continue
+            rx = self.person_variants_rx[tag]
+            if rx is None:
+                continue
 
-                rx = re.compile(r'(?<!\w)'+re.escape(pat)+r'(?!\w)', re.IGNORECASE)
+            # Množina variant této osoby – callback jen přidá nalezený tvar
+            seen_add = persons['vars'][persons['rev'][f'{p["first"]} {p["last"]}']].add
 
-                def repl(m):
-                    surf = m.group(0)
-                    # Zaznamenej tuto variantu
-                    canonical = f'{p["first"]} {p["last"]}'
-                    self.entity_map['PERSON'][canonical].add(surf)
-                    return tag
+            def repl(m):
+                # Zaznamenej tuto variantu (internovaně – stejné tvary se opakují napříč osobami i dokumenty dávky)
+                seen_add(sys.intern(m.group(0)))
+                return tag
 
-                text = rx.sub(repl, text)
+            text = rx.sub(repl, text)
 
         return text
 
@@ -1139,12 +1552,8 @@ class Anonymizer:
 
             return f"({prefix} {tag})"
 
-        maiden_name_pattern = re.compile(
-            r'\((rozená|rozenou|roz\.|dříve|dřív|původně)\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\)',
-            re.UNICODE | re.IGNORECASE
-        )
-
-        text = maiden_name_pattern.sub(replace_maiden_name, text)
+        if '(' in text:
+            text = _MAIDEN_NAME_RE.sub(replace_maiden_name, text)
 
         # ========== FÁZE 3: SAMOSTATNÁ PŘÍJMENÍ ==========
         # Pattern: "Novák uvedl", "pan Dvořák", "Novákovi bylo", "od Maláové"
@@ -1165,20 +1574,9 @@ class Anonymizer:
             else:
                 return tag
 
-        # Pattern pro samostatné příjmení s kontextem
-        # Zachytí: "pan Novák", "paní Malá", "Novák uvedl", "Novákovi bylo"
-        standalone_surname_pattern = re.compile(
-            r'(?:'
-            r'(?:pan|paní|pana|paní|panu)\s+([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)|'  # pan Novák
-            r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+ov[ia])\s+(?:uvedl|uvedla|řekl|řekla|byl|byla|měl|měla)|'  # Novákovi uvedl
-            r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+(?:uvedl|uvedla|řekl|řekla|potvrdil|potvrdila)'  # Novák uvedl
-            r')',
-            re.UNICODE | re.IGNORECASE
-        )
-
         # POZOR: Tento pattern může zachytit i false positives, takže musíme být opatrní
         # Raději ho zatím zakomentujeme a přidáme později po testování
-        # text = standalone_surname_pattern.sub(replace_standalone_surname, text)
+        # text = _STANDALONE_SURNAME_RE.sub(replace_standalone_surname, text)
 
         # ========== FÁZE 3.7: SAMOSTATNÁ KŘESTNÍ JMÉNA ==========
         # Pattern: "Jakub pracoval jako...", "Eva řekla...", ale NE "Praha", "Česká", atd.
@@ -1191,11 +1589,7 @@ class Anonymizer:
                 return match.group(0)
 
             # Ignore list - slova která vypadají jako jména, ale nejsou
-            ignore_words = {
-                'praha', 'brno', 'ostrava', 'plzeň', 'česká', 'slovenská',
-                'evropa', 'amerika', 'asie', 'afrika', 'čech', 'moravia'
-            }
-            if name_lower in ignore_words:
+            if name_lower in _STANDALONE_IGNORE_WORDS:
                 return match.group(0)
 
             # Vytvoř/najdi tag pro samostatné křestní jméno
@@ -1203,13 +1597,6 @@ class Anonymizer:
 
             return tag
 
-        # Pattern pro samostatné křestní jméno následované slovesem nebo "jako"
-        # Rozšířeno o uvozovky a další slovesa
-        standalone_first_name_pattern = re.compile(
-            r'(?:^|["\s])([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+(?:pracoval|pracovala|řekl|řekla|uvedl|uvedla|jako|byl|byla|je|jsou|měl|měla|dělal|dělala)',
-            re.UNICODE | re.MULTILINE
-        )
-
         def replace_standalone_wrapper(match):
             # Zachovej prefix (uvozovky nebo mezeru)
             prefix = match.group(0)[0] if match.group(0)[0] in ('"', ' ', '\n', '\t') else ''
@@ -1219,64 +1606,39 @@ class Anonymizer:
                 return prefix + result[len(prefix):] if prefix else result
             return match.group(0)
 
-        text = standalone_first_name_pattern.sub(replace_standalone_wrapper, text)
+        text = _STANDALONE_FIRST_NAME_RE.sub(replace_standalone_wrapper, text)
 
-        # DÁLE: Pattern pro jména s titulem (MUDr. Eva Malá)
+        # DÁLE: Jména s titulem (MUDr. Eva Malá)
         # Tento musí jít PŘED obecným pattern aby titul nebyl ztracen
-        titled_pattern = re.compile(
-            r'(Ing\.|Mgr\.|Bc\.|MUDr\.|JUDr\.|PhDr\.|RNDr\.|Prof\.|Doc\.|Ph\.D\.|MBA|CSc\.|DrSc\.)\s+'
-            r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\s+'
-            r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)',
-            re.UNICODE
-        )
-
         def replace_titled(match):
             title = match.group(1)
             first = match.group(2)
             last = match.group(3)
+            # Tokeny jsou jen česká písmena – lowercase se spočítá jednou pro všechny kontroly
+            first_lo = first.lower()
+            last_lo = last.lower()
+            first_flags = _PERSON_WORD_FLAGS.get(first_lo, 0)
 
             # ========== VALIDACE - STEJNÁ JAKO V replace_person() ==========
 
             # 1. Blacklist kritických slov
-            critical_blacklist = {
-                's.r.o.', 'a.s.', 'spol.', 'k.s.', 'v.o.s.', 'o.p.s.',
-                'ltd', 'inc', 'corp', 'gmbh', 'llc',
-                'czech', 'republic', 'synlab', 'gymnázium', 'gymnasium',
-                'university', 'univerzita', 'fakulta', 'klinika', 'nemocnice',
-                'centrum', 'ústav', 'institute', 'academy', 'akademie',
-                'kaspersky', 'endpoint', 'latitude', 'archer', 'classic',
-                'windows', 'linux', 'android', 'ios', 'office', 'excel',
-                'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
-                'manager', 'director', 'chief', 'officer',
-                'vyšetřující', 'vyšetřovatel', 'lékař', 'doktor', 'sestra'
-            }
-
-            combined = f"{first} {last}".lower()
-            for word in critical_blacklist:
-                if word in combined:
-                    return match.group(0)  # Není osoba
+
+            combined = f"{first_lo} {last_lo}"
+            if _TITLED_CRITICAL_BLACKLIST_RE.search(combined):
+                return match.group(0)  # Není osoba
 
             # 2. Role detection - pokud první slovo je role
-            role_words = {
-                'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
-                'manager', 'director', 'chief', 'officer',
-                'specialist', 'consultant', 'coordinator',
-                'developer', 'architect', 'engineer', 'analyst',
-                'vyšetřující', 'vyšetřovatel', 'lékař', 'doktor'
-            }
-            if first.lower() in role_words:
+            if first_flags & _W_TITLED_ROLE:
                 return match.group(0)  # Role, ne osoba
 
             # 3. Validace křestního jména
-            first_lo = first.lower()
-            common_czech_names = {'jan', 'petr', 'pavel', 'jiří', 'josef', 'tomáš', 'martin', 'jakub', 'david', 'daniel'}
 
-            if first_lo not in CZECH_FIRST_NAMES and first_lo not in common_czech_names:
+            if first_lo not in CZECH_FIRST_NAMES and not first_flags & _W_COMMON_NAME:
                 # Zkrácené genitivy (Han, Elišk, Radk) - odmítnout
                 if len(first) < 3:
                     return match.group(0)
                 # Pokud má 3 znaky a nekončí na samohlásku ani n/l/r
-                if len(first) == 3 and not first_lo[-1] in 'aeiouyáéíóúůýnlr':
+                if len(first) == 3 and first_lo[-1] not in _SHORT_NAME_FINALS:
                     return match.group(0)
                 # Zkrácené tvary končící na 'k' (4-5 znaků)
                 if 4 <= len(first) <= 5 and first_lo[-1] == 'k':
@@ -1290,128 +1652,43 @@ class Anonymizer:
             return f"{title} {tag}"
 
         # Nahraď titulované osoby NEJPRVE
-        text = titled_pattern.sub(replace_titled, text)
+        if '.' in text or 'MBA' in text:  # každý titul obsahuje tečku, kromě MBA
+            text = _TITLED_PERSON_RE.sub(replace_titled, text)
 
         # Pak běžný pattern pro jména bez titulu
         titles = r'(?:Ing\.|Mgr\.|Bc\.|MUDr\.|JUDr\.|PhDr\.|RNDr\.|Ph\.D\.|MBA|CSc\.|DrSc\.)'
 
-        # Pattern pro jméno příjmení
-        person_pattern = re.compile(
-            r'\b([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)'
-            r'\s+'
-            r'([A-ZÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ][a-záčďéěíňóřšťúůýž]+)\b',
-            re.UNICODE
-        )
-
+        # Jméno příjmení (_PERSON_NAME_RE)
         def replace_person(match):
             first_obs = match.group(1)
             last_obs = match.group(2)
+            # Tokeny jsou jen česká písmena – lowercase se spočítá jednou pro všechny kontroly
+            first_lo = first_obs.lower()
+            last_lo = last_obs.lower()
+            first_flags = _PERSON_WORD_FLAGS.get(first_lo, 0)
 
             # ========== A) BLACKLIST NE-OSOB ==========
 
             # 1. Blacklist kritických slov (firmy, instituce, produkty, role)
-            critical_blacklist = {
-                # Firmy a právní formy
-                's.r.o.', 'a.s.', 'spol.', 'k.s.', 'v.o.s.', 'o.p.s.',
-                'ltd', 'inc', 'corp', 'gmbh', 'llc',
-                # Instituce
-                'czech', 'republic', 'synlab', 'gymnázium', 'gymnasium',
-                'university', 'univerzita', 'fakulta', 'klinika', 'nemocnice',
-                'centrum', 'ústav', 'institute', 'academy', 'akademie',
-                'motol', 'bulovka', 'thomayer', 'center',
-                # Produkty/Software
-                'kaspersky', 'endpoint', 'latitude', 'archer', 'classic',
-                'windows', 'linux', 'android', 'ios', 'office', 'excel',
-                # Role/Pozice (když jsou samostatně)
-                'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
-                'manager', 'director', 'chief', 'officer',
-                'vyšetřující', 'vyšetřovatel', 'lékař', 'doktor', 'sestra'
-            }
 
             # Kontrola, zda hodnota obsahuje blacklist slovo
-            combined = f"{first_obs} {last_obs}".lower()
-            for word in critical_blacklist:
-                if word in combined:
-                    return match.group(0)  # Není osoba
+            combined = f"{first_lo} {last_lo}"
+            if _PERSON_CRITICAL_BLACKLIST_RE.search(combined):
+                return match.group(0)  # Není osoba
 
             # 2. Rozšířený ignore list (původní)
-            ignore_words = {
-                # Běžná slova ve smlouvách
-                'místo', 'datum', 'částku', 'bytem', 'sídlo', 'adresa',
-                'číslo', 'kontakt', 'telefon', 'email', 'rodné', 'narozena',
-                'vydán', 'uzavřena', 'podepsána', 'smlouva', 'dohoda',
-                # Místa
-                'staré', 'město', 'nové', 'město', 'malá', 'strana',
-                'václavské', 'náměstí', 'hlavní', 'nádraží',
-                # Organizace/instituce klíčová slova
-                'česká', 'spořitelna', 'komerční', 'banka', 'raiffeisen',
-                'credit', 'bank', 'financial', 'global', 'senior',
-                'junior', 'lead', 'chief', 'head', 'director',
-                # Finance/Investment
-                'capital', 'equity', 'value', 'crescendo', 'investment',
-                'fund', 'holdings', 'partners', 'assets', 'portfolio',
-                # Pozice/role
-                'jednatel', 'jednatelka', 'ředitel', 'ředitelka',
-                'auditor', 'manager', 'consultant', 'specialist',
-                'assistant', 'coordinator', 'analyst', 'pacient',
-                'scrum', 'master', 'developer', 'architect', 'engineer',
-                'officer', 'professional', 'certified', 'advanced',
-                'management', 'legal', 'counsel', 'executive',
-                # Pozdravy/oslovení
-                'ahoj', 'dobrý', 'den', 'vážený', 'vážená',
-                # Značky aut
-                'škoda', 'octavia', 'fabia', 'superb', 'kodiaq',
-                'volkswagen', 'toyota', 'ford', 'bmw', 'audi',
-                # Technologie a software
-                'google', 'amazon', 'microsoft', 'apple', 'facebook',
-                'cloud', 'web', 'tech', 'solutions', 'data', 'digital',
-                'software', 'enterprise', 'premium', 'standard',
-                'analytics', 'computer', 'vision', 'protection',
-                'security', 'authenticator', 'repository', 'access',
-                'personal', 'hub', 'book', 'pro', 'series', 'launch',
-                'team', 'development', 'react', 'splunk', 'innovate',
-                'ventures', 'credo', 'mayo', 'clinic', 'met', 'london',
-                'avenue', 'contractual', 'plánovaná', 'diagno',
-                'cisco', 'processing', 'notářská',
-                # Zdravotnictví + Léky/Produkty
-                'nemocnice', 'poliklinika', 'polikliniek', 'nemocniec',
-                'healthcare', 'symbicort', 'turbuhaler', 'spirometr',
-                'jaeger', 'medical', 'health', 'pharma', 'pharmaceutical',
-                # Další
-                'care', 'plus', 'minus', 'service', 'services',
-                'group', 'company', 'corp', 'ltd', 'gmbh', 'inc'
-            }
 
             # Kontrola proti ignore listu
-            if first_obs.lower() in ignore_words or last_obs.lower() in ignore_words:
+            if first_flags & _W_IGNORE or last_lo in _PERSON_IGNORE_WORDS:
                 return match.group(0)
 
             # 3. Detekce firem, produktů, institucí (neměly by být PERSON)
-            non_person_patterns = [
-                # Tech/Software
-                r'\b(tech|cloud|web|solutions?|data|digital|software|analytics)\b',
-                r'\b(team|hub|enterprise|premium|standard|professional)\b',
-                r'\b(google|amazon|microsoft|apple|facebook|splunk|cisco)\b',
-                r'\b(repository|authenticator|vision|protection|security)\b',
-                # Finance/Investment
-                r'\b(capital|equity|value|investment|fund|holdings|assets)\b',
-                r'\b(crescendo|ventures|partners|portfolio)\b',
-                # Management/Business
-                r'\b(management|processing|executive|legal|counsel)\b',
-                r'\b(clinic|series|launch|innovate|healthcare)\b',
-                # Products/Medical
-                r'\b(symbicort|turbuhaler|spirometr|jaeger)\b',
-                r'\b(pharma|pharmaceutical|medical)\b',
-                # Company suffixes když jsou uprostřed
-                r'\b(group|company|corp|ltd|gmbh|inc|services?)\b'
-            ]
-            for pattern in non_person_patterns:
-                if re.search(pattern, combined):
-                    return match.group(0)
+            if NON_PERSON_RE.search(combined):
+                return match.group(0)
 
             # 4. Detekce názvů firem (končí na s.r.o., a.s., spol., Ltd. atd.)
             context_after = text[match.end():match.end()+20]
-            if re.search(r'^\s*(s\.r\.o\.|a\.s\.|spol\.|k\.s\.|v\.o\.s\.|ltd\.?|inc\.?)', context_after, re.IGNORECASE):
+            if _COMPANY_FORM_AFTER_RE.search(context_after):
                 return match.group(0)
 
             # ========== B) VALIDACE ČESKÉ OSOBY ==========
@@ -1421,40 +1698,22 @@ class Anonymizer:
             # Každý token začíná velkým písmenem (již splněno)
 
             # 6. Validace českého příjmení (poslední token)
-            last_lo = last_obs.lower()
-
-            # Typické české příjmení koncovky
-            valid_surname_suffixes = (
-                'ová', 'á',  # ženské
-                'ek', 'ák', 'ík', 'ský', 'cký', 'čák', 'ec', 'el',  # mužské
-                'a',  # Svoboda, Skála, Liška
-                'ý', 'í',  # přídavná jména
-                # Další běžné koncovky
-                'an', 'en', 'in', 'on', 'un',  # Urban, Marin, Kubín, atd.
-                'eš', 'iš', 'uš', 'áš', 'íš',  # Beneš, Kříž, Lukáš, atd.
-                'or', 'ar', 'ir', 'ur',  # Gregor, Kohár, atd.
-                'ov', 'ev', 'av', 'iv',  # Petrov, Medveděv, atd.
-                'áč', 'ič', 'oč', 'ůč',  # Horváč, Novič, atd.
-                'át', 'ůt', 'ut', 'et'   # Sovát, Kůt, atd.
-            )
 
             # Pokud příjmení nekončí na typickou koncovku → pravděpodobně není osoba
             # ALE: pokud je to jednoslabičné anglické slovo (např. "Met", "Hub"), může to být produkt/firma
-            if not last_lo.endswith(valid_surname_suffixes):
+            if not has_valid_surname_suffix(last_lo):
                 # Zkontroluj, jestli je to jednoslabičné anglické slovo (firma/produkt)
                 # Např: "Met London", "Hub Team", "Pro Series"
-                if len(last_obs) <= 3 or last_obs.lower() in {'hub', 'pro', 'met', 'net', 'web', 'app', 'lab', 'dev'}:
+                if len(last_obs) <= 3 or last_lo in _PRODUCT_SHORT_WORDS:
                     return match.group(0)  # Pravděpodobně firma/produkt
                 # Jinak je to OK (může to být méně běžné české příjmení)
 
             # 7. Validace křestního jména (musí být v knihovně nebo mít typickou českou strukturu)
-            first_lo = first_obs.lower()
 
             # Whitelist běžných českých jmen (nejsou v knihovně, ale jsou validní)
-            common_czech_names = {'jan', 'petr', 'pavel', 'jiří', 'josef', 'tomáš', 'martin', 'jakub', 'david', 'daniel'}
 
             # Pokud křestní jméno JE v knihovně nebo v whitelistu → OK
-            if first_lo in CZECH_FIRST_NAMES or first_lo in common_czech_names:
+            if first_lo in CZECH_FIRST_NAMES or first_flags & _W_COMMON_NAME:
                 pass  # OK
             else:
                 # Není v knihovně ani v whitelistu → kontroluj strukturu
@@ -1468,7 +1727,7 @@ class Anonymizer:
                     # Pokud nekončí na samohlásku ani na 'n', 'l', 'r' → zkrácený genitiv
                     # "Jan", "Dan", "Ivo" = OK
                     # "Han" (z "Hana"), "Jev" (z "Eva") = NENÍ OK
-                    if not first_lo[-1] in 'aeiouyáéíóúůýnlr':
+                    if first_lo[-1] not in _SHORT_NAME_FINALS:
                         return match.group(0)
 
                 # Pokud má 4-5 znaků:
@@ -1477,18 +1736,12 @@ class Anonymizer:
                     if first_lo[-1] == 'k':
                         return match.group(0)
                     # Pokud nekončí na samohlásku ani na typickou mužskou koncovku
-                    if not first_lo[-1] in 'aeiouyáéíóúůýnlršm':
+                    if first_lo[-1] not in _NAME_FINALS:
                         return match.group(0)
 
             # 8. Detekce rolí ("Ředitelka Centrum")
             # Pokud první slovo je role → není to osoba
-            role_words = {
-                'ředitelka', 'ředitel', 'jednatel', 'jednatelka',
-                'manager', 'director', 'chief', 'officer',
-                'specialist', 'consultant', 'coordinator',
-                'developer', 'architect', 'engineer', 'analyst'
-            }
-            if first_obs.lower() in role_words:
+            if first_flags & _W_ROLE:
                 return match.group(0)  # Role, ne osoba
 
             # ========== C) INFERENCE KANONICKÉHO JMÉNA ==========
@@ -1507,7 +1760,7 @@ class Anonymizer:
             existing_surname_stem = None
 
             # Nejdřív zjisti rod aktuálního příjmení
-            current_is_female = last_nom.lower().endswith(('ová', 'á'))
+            current_is_female = last_nom.lower().endswith('á')
 
             for p in self.canonical_persons:
                 existing_last = p['last']
@@ -1517,7 +1770,7 @@ class Anonymizer:
                 existing_last_lo = existing_last.lower()
 
                 # Zjisti rod existujícího příjmení
-                existing_is_female = existing_last_lo.endswith(('ová', 'á'))
+                existing_is_female = existing_last_lo.endswith('á')
 
                 # MUSÍ být stejný rod!
                 if existing_is_female != current_is_female:
@@ -1559,16 +1812,15 @@ class Anonymizer:
                 last_nom = existing_surname_stem
 
             # Určení rodu podle příjmení
-            is_female_surname = last_nom.lower().endswith(('ová', 'á'))
+            is_female_surname = last_nom.lower().endswith('á')
 
             # Inference křestního jména podle rodu příjmení
-            first_lo = first_obs.lower()
 
             # Pokud příjmení je ženské, jméno musí být ženské
             if is_female_surname:
                 # Han → Hana, Martin → Martina
                 # Pravidlo: pokud jméno končí na souhlásku, přidej 'a'
-                if not first_lo.endswith(('a', 'e', 'i', 'o', 'u', 'y')):
+                if first_lo[-1:] not in _VOWELS:
                     # Jméno končí na souhlásku → přidej 'a'
                     first_nom = (first_obs + 'a').capitalize()
                 elif first_lo.endswith('a'):
@@ -1582,8 +1834,7 @@ class Anonymizer:
                 # Jana → Jan, Petra → Petr, Radka → Radek (použij inference!)
                 if first_lo.endswith('a') and len(first_lo) > 2:
                     # Výjimky - skutečná mužská jména končící na 'a'
-                    male_names_with_a = {'kuba', 'míla', 'nikola', 'saša', 'jirka', 'honza'}
-                    if first_lo in male_names_with_a:
+                    if first_lo in _MALE_NAMES_WITH_A:
                         first_nom = first_obs.capitalize()
                     else:
                         # FORCE MASCULINE CONVERSION - použij přímo _male_genitive_to_nominative
@@ -1606,7 +1857,7 @@ class Anonymizer:
 
             return tag
 
-        text = person_pattern.sub(replace_person, text)
+        text = _PERSON_NAME_RE.sub(replace_person, text)
         return text
 
     def anonymize_entities(self, text: str) -> str:
@@ -1615,6 +1866,12 @@ class Anonymizer:
         # DŮLEŽITÉ: Pořadí je klíčové! Od nejvíce specifických po nejméně specifické
         # KRITICKÉ: Credentials (hesla, API klíče) PRVNÍ s store_value=False!
 
+        # Vzory, které bez číslice nemohou nic najít, se pouští jen na text s číslicí
+        # (test se opakuje na aktuálním textu – náhrady mění jeho obsah)
+        has_digit = _DIGIT_RE.search
+        # Obdobně vzory vyžadující oddělovač nebo jiný pevný znak (viz podmínky níže)
+        has_assign = _ASSIGN_SEP_RE.search
+
         # 1. CREDENTIALS (username / password) - NEJPRVE!
         def replace_credentials(match):
             username = match.group(2)
@@ -1623,32 +1880,38 @@ class Anonymizer:
             # TEST MODE: store_value=True (ukládá plnou hodnotu)
             password_tag = self._get_or_create_label('PASSWORD', password, store_value=True)
             return f"{match.group(1)}: {username_tag} / {password_tag}"
-        text = CREDENTIALS_RE.sub(replace_credentials, text)
+        if ':' in text and '/' in text:
+            text = CREDENTIALS_RE.sub(replace_credentials, text)
 
         # 2. HESLA (TEST MODE: store_value=True)
         def replace_password(match):
             return self._get_or_create_label('PASSWORD', match.group(1), store_value=True)
-        text = PASSWORD_RE.sub(replace_password, text)
+        if has_assign(text):
+            text = PASSWORD_RE.sub(replace_password, text)
 
         # 2. API KLÍČE, SECRETS (TEST MODE: store_value=True)
         def replace_api_key(match):
             return self._get_or_create_label('API_KEY', match.group(1), store_value=True)
-        text = API_KEY_RE.sub(replace_api_key, text)
+        if has_assign(text):
+            text = API_KEY_RE.sub(replace_api_key, text)
 
         def replace_secret(match):
             return self._get_or_create_label('SECRET', match.group(1), store_value=True)
-        text = SECRET_RE.sub(replace_secret, text)
+        if has_assign(text):
+            text = SECRET_RE.sub(replace_secret, text)
 
         # 3. SSH KLÍČE (TEST MODE: store_value=True)
         def replace_ssh_key(match):
             return self._get_or_create_label('SSH_KEY', match.group(1), store_value=True)
-        text = SSH_KEY_RE.sub(replace_ssh_key, text)
+        if '-' in text:
+            text = SSH_KEY_RE.sub(replace_ssh_key, text)
 
         # 3.5. IBAN (PŘED kartami! IBAN má dlouhé číselné sekvence)
         # TEST MODE: store_value=True (ukládá plnou hodnotu)
         def replace_iban(match):
             return self._get_or_create_label('IBAN', match.group(1), store_value=True)
-        text = IBAN_RE.sub(replace_iban, text)
+        if has_digit(text):
+            text = IBAN_RE.sub(replace_iban, text)
 
         # 4. PLATEBNÍ KARTY (TEST MODE: store_value=True)
         def replace_card(match):
@@ -1657,30 +1920,36 @@ class Anonymizer:
             if card:
                 return self._get_or_create_label('CARD', card, store_value=True)
             return match.group(0)
-        text = CARD_RE.sub(replace_card, text)
+        if has_digit(text):
+            text = CARD_RE.sub(replace_card, text)
 
         # 5. USERNAMES, ACCOUNTS, HOSTNAMES
         def replace_username(match):
             return self._get_or_create_label('USERNAME', match.group(1))
-        text = USERNAME_RE.sub(replace_username, text)
+        if has_assign(text):
+            text = USERNAME_RE.sub(replace_username, text)
 
         def replace_account_id(match):
             return self._get_or_create_label('ACCOUNT_ID', match.group(1))
-        text = ACCOUNT_ID_RE.sub(replace_account_id, text)
+        if has_digit(text):
+            text = ACCOUNT_ID_RE.sub(replace_account_id, text)
 
         def replace_hostname(match):
             return self._get_or_create_label('HOST', match.group(1))
-        text = HOSTNAME_RE.sub(replace_hostname, text)
+        if has_assign(text):
+            text = HOSTNAME_RE.sub(replace_hostname, text)
 
         # 6. IP ADRESY
         def replace_ip(match):
             return self._get_or_create_label('IP', match.group(1))
-        text = IP_RE.sub(replace_ip, text)
+        if has_digit(text):
+            text = IP_RE.sub(replace_ip, text)
 
         # 7. ČÍSLA POJIŠTĚNCE
         def replace_insurance_id(match):
             return self._get_or_create_label('INSURANCE_ID', match.group(1))
-        text = INSURANCE_ID_RE.sub(replace_insurance_id, text)
+        if has_digit(text):
+            text = INSURANCE_ID_RE.sub(replace_insurance_id, text)
 
         # 8. RFID/BADGE
         def replace_rfid(match):
@@ -1690,17 +1959,20 @@ class Anonymizer:
         # 8.1. SOCIÁLNÍ SÍTĚ (KRITICKÉ - PII)
         def replace_linkedin(match):
             return self._get_or_create_label('LINKEDIN', match.group(1))
-        text = LINKEDIN_RE.sub(replace_linkedin, text)
+        if '://' in text:
+            text = LINKEDIN_RE.sub(replace_linkedin, text)
 
         def replace_facebook(match):
             return self._get_or_create_label('FACEBOOK', match.group(1))
-        text = FACEBOOK_RE.sub(replace_facebook, text)
+        if '://' in text:
+            text = FACEBOOK_RE.sub(replace_facebook, text)
 
         def replace_instagram(match):
             # Instagram má 2 capture groups - handle nebo URL
             handle = match.group(1) if match.group(1) else match.group(2)
             return self._get_or_create_label('INSTAGRAM', handle)
-        text = INSTAGRAM_RE.sub(replace_instagram, text)
+        if '@' in text or '://' in text:
+            text = INSTAGRAM_RE.sub(replace_instagram, text)
 
         def replace_skype(match):
             return self._get_or_create_label('SKYPE', match.group(1))
@@ -1715,13 +1987,15 @@ class Anonymizer:
             # BIO_HASH_RE má 2 capture groups
             bio_hash = match.group(1) if match.group(1) else match.group(2)
             return self._get_or_create_label('BIO_HASH', bio_hash)
-        text = BIO_HASH_RE.sub(replace_bio_hash, text)
+        if ':' in text or '_' in text:
+            text = BIO_HASH_RE.sub(replace_bio_hash, text)
 
         def replace_photo_id(match):
             # Photo ID má 3 capture groups
             photo_id = match.group(1) if match.group(1) else (match.group(2) if match.group(2) else match.group(3))
             return self._get_or_create_label('PHOTO_ID', photo_id)
-        text = PHOTO_ID_RE.sub(replace_photo_id, text)
+        if '.' in text:
+            text = PHOTO_ID_RE.sub(replace_photo_id, text)
 
         def replace_api_key_enhanced(match):
             return self._get_or_create_label('API_KEY', match.group(1))
@@ -1730,17 +2004,20 @@ class Anonymizer:
         # 9. ADRESY (před jmény, aby "Novákova 45" nebylo osobou)
         def replace_address(match):
             return self._get_or_create_label('ADDRESS', match.group(0))
-        text = ADDRESS_RE.sub(replace_address, text)
+        if _ADDRESS_HINT_RE.search(text):
+            text = _sub_address(replace_address, text)
 
         # 10. EMAILY (před ostatními, protože obsahují speciální znaky)
         def replace_email(match):
             return self._get_or_create_label('EMAIL', match.group(1))
-        text = EMAIL_RE.sub(replace_email, text)
+        if '@' in text:
+            text = EMAIL_RE.sub(replace_email, text)
 
         # 11. DATUM NAROZENÍ (před BIRTH_ID a všemi daty)
         def replace_dob(match):
             return self._get_or_create_label('DATE', match.group(1))
-        text = DOB_RE.sub(replace_dob, text)
+        if has_digit(text):
+            text = DOB_RE.sub(replace_dob, text)
 
         # 12. RODNÁ ČÍSLA (PŘED BANK! Jinak "Rodné číslo: 850123/1234" by se rozpadlo)
         # KRITICKÁ PRIORITA: Silný kontext ("Rodné číslo:") má přednost před bank účty
@@ -1751,7 +2028,8 @@ class Anonymizer:
                 birth_id_clean = birth_id.replace(' ', '')
                 return self._get_or_create_label('BIRTH_ID', birth_id_clean)
             return match.group(0)
-        text = BIRTH_ID_RE.sub(replace_birth_id, text)
+        if has_digit(text):
+            text = BIRTH_ID_RE.sub(replace_birth_id, text)
 
         # 13. BANKOVNÍ ÚČTY (po BIRTH_ID, aby RČ nebylo zachyceno jako účet)
         # DŮLEŽITÉ: Kód banky musí být součástí tagu (BANK_RE ho zachytí pokud je přítomen)
@@ -1762,7 +2040,8 @@ class Anonymizer:
                 # TEST MODE: store_value=True (ukládá plnou hodnotu)
                 return self._get_or_create_label('BANK', account, store_value=True)
             return match.group(0)
-        text = BANK_RE.sub(replace_bank, text)
+        if has_digit(text):
+            text = BANK_RE.sub(replace_bank, text)
 
         # 14. ČÍSLA OP (KRITICKÉ: MUSÍ být PŘED telefony!)
         def replace_id_card(match):
@@ -1770,7 +2049,8 @@ class Anonymizer:
             if id_card:
                 return self._get_or_create_label('ID_CARD', id_card)
             return match.group(0)
-        text = ID_CARD_RE.sub(replace_id_card, text)
+        if has_digit(text):
+            text = ID_CARD_RE.sub(replace_id_card, text)
 
         # 14.5. VARIABILNÍ SYMBOL (PŘED telefony! VS čísla nejsou telefony)
 
@@ -1792,32 +2072,38 @@ class Anonymizer:
         def replace_phone(match):
             # PHONE_RE má capture group (1) pro samotné číslo (bez prefixu!)
             return self._get_or_create_label('PHONE', match.group(1))
-        text = PHONE_RE.sub(replace_phone, text)
+        if has_digit(text):
+            text = PHONE_RE.sub(replace_phone, text)
 
         # 16. DIČ (před IČO)
         def replace_dic(match):
             return self._get_or_create_label('DIC', match.group(1))
-        text = DIC_RE.sub(replace_dic, text)
+        if has_digit(text):
+            text = DIC_RE.sub(replace_dic, text)
 
         # 16.5. GENETICKÉ IDENTIFIKÁTORY (PŘED IČO! rs... nejsou IČO)
         def replace_genetic_id(match):
             return self._get_or_create_label('GENETIC_ID', match.group(1))
-        text = GENETIC_ID_RE.sub(replace_genetic_id, text)
+        if has_digit(text):
+            text = GENETIC_ID_RE.sub(replace_genetic_id, text)
 
         # 16.6. DATUM NAROZENÍ
         def replace_birth_date(match):
             return self._get_or_create_label('BIRTH_DATE', match.group(1))
-        text = BIRTH_DATE_RE.sub(replace_birth_date, text)
+        if has_digit(text):
+            text = BIRTH_DATE_RE.sub(replace_birth_date, text)
 
         # 16.7. ČÍSLO PASU
         def replace_passport(match):
             return self._get_or_create_label('PASSPORT', match.group(1))
-        text = PASSPORT_RE.sub(replace_passport, text)
+        if has_digit(text):
+            text = PASSPORT_RE.sub(replace_passport, text)
 
         # 16.8. ŘIDIČSKÝ PRŮKAZ
         def replace_driver_license(match):
             return self._get_or_create_label('DRIVER_LICENSE', match.group(1))
-        text = DRIVER_LICENSE_RE.sub(replace_driver_license, text)
+        if has_digit(text):
+            text = DRIVER_LICENSE_RE.sub(replace_driver_license, text)
 
         # 16.9. BENEFITNÍ KARTY (MultiSport, Sodexo) - PII!
         def replace_benefit_card(match):
@@ -1825,7 +2111,8 @@ class Anonymizer:
             if card_id:
                 return self._get_or_create_label('BENEFIT_CARD', card_id)
             return match.group(0)
-        text = BENEFIT_CARD_RE.sub(replace_benefit_card, text)
+        if has_digit(text):
+            text = BENEFIT_CARD_RE.sub(replace_benefit_card, text)
 
         # 17. IČO
         def replace_ico(match):
@@ -1840,7 +2127,8 @@ class Anonymizer:
             if match.group(1):
                 return self._get_or_create_label('ICO', match.group(1))
             return full
-        text = ICO_RE.sub(replace_ico, text)
+        if has_digit(text):
+            text = ICO_RE.sub(replace_ico, text)
 
         # 18. SPZ / License Plates
         def replace_license_plate(match):
@@ -1859,11 +2147,12 @@ class Anonymizer:
             # Kontrola kontextu - nesmí být po "od", "z", "do", "roku"
             start_pos = match.start()
             context_before = text[max(0, start_pos-10):start_pos].lower()
-            if any(word in context_before for word in ['od ', 'z ', 'do ', 'roku ']):
+            if _PLATE_YEAR_CONTEXT_RE.search(context_before):
                 return match.group(0)
 
             return self._get_or_create_label('LICENSE_PLATE', plate)
-        text = LICENSE_PLATE_RE.sub(replace_license_plate, text)
+        if has_digit(text):
+            text = LICENSE_PLATE_RE.sub(replace_license_plate, text)
 
         # 18.1. VIN (Vehicle Identification Number)
         def replace_vin(match):
@@ -1879,7 +2168,8 @@ class Anonymizer:
             if mac:
                 return self._get_or_create_label('MAC', mac)
             return match.group(0)
-        text = MAC_RE.sub(replace_mac, text)
+        if has_assign(text) or '.' in text:
+            text = MAC_RE.sub(replace_mac, text)
 
         # 18.3. IMEI (International Mobile Equipment Identity)
         def replace_imei(match):
@@ -1887,23 +2177,27 @@ class Anonymizer:
             if imei:
                 return self._get_or_create_label('IMEI', imei)
             return match.group(0)
-        text = IMEI_RE.sub(replace_imei, text)
+        if has_digit(text):
+            text = IMEI_RE.sub(replace_imei, text)
 
         # 19. ČÁSTKY (AŽ NAKONEC! Po telefonech a všech číselných identifikátorech)
 
         # 20. MASKOVÁNÍ CVV/EXPIRACE u karet
         # Nahradí "CVV: 123" → "CVV: ***" a "exp: 12/26" → "exp: **/**"
-        text = re.sub(r'(CVV|CVC)\s*:\s*\d{3,4}', r'\1: ***', text, flags=re.IGNORECASE)
-        text = re.sub(r'exp(?:\.|\s+|iration)?\s*:?\s*\d{2}/\d{2,4}', r'exp: **/**', text, flags=re.IGNORECASE)
+        if has_digit(text):
+            text = re.sub(r'(CVV|CVC)\s*:\s*\d{3,4}', r'\1: ***', text, flags=re.IGNORECASE)
+        if has_digit(text):
+            text = re.sub(r'exp(?:\.|\s+|iration)?\s*:?\s*\d{2}/\d{2,4}', r'exp: **/**', text, flags=re.IGNORECASE)
 
         # 20.5. CLEANUP biometrických identifikátorů - odstraň [[PHONE_*]] z bio prefixů
         # "IRIS_SCAN_PD_[[PHONE_10]]" → "IRIS_SCAN_PD_10"
         # "VOICE_RK_[[PHONE_11]]" → "VOICE_RK_11"
-        text = re.sub(
-            r'(IRIS_SCAN|VOICE_RK|HASH_BIO|FINGERPRINT|FACIAL|RETINA|PALM|DNA)_([A-Z0-9_]*)\[\[PHONE_(\d+)\]\]',
-            r'\1_\2\3',
-            text
-        )
+        if has_digit(text):
+            text = re.sub(
+                r'(IRIS_SCAN|VOICE_RK|HASH_BIO|FINGERPRINT|FACIAL|RETINA|PALM|DNA)_([A-Z0-9_]*)\[\[PHONE_(\d+)\]\]',
+                r'\1_\2\3',
+                text
+            )
 
         # 20.6. BANK FRAGMENTS - zachyť fragmenty účtů s vloženým [[BIRTH_ID_*]]
         # "1928[[BIRTH_ID_6]]" → "[[BANK_x]]"
@@ -1918,7 +2212,8 @@ class Anonymizer:
             r'(?:číslo\s+účtu|účet|účtu|platba\s+na\s+účet|bankovní\s+účet)\s*:?\s*(\d{0,10}\[\[BIRTH_ID_\d+\]\]\d{0,10})',
             re.IGNORECASE
         )
-        text = bank_fragment_pattern.sub(replace_bank_fragment, text)
+        if has_digit(text):
+            text = bank_fragment_pattern.sub(replace_bank_fragment, text)
 
         # 21. END-SCAN - finální kontrola citlivých dat (chytá zbytky nalepené na ]])
         text = self._end_scan(text)
@@ -1943,6 +2238,8 @@ class Anonymizer:
 
     def _end_scan(self, text: str) -> str:
         """Finální sken po všech náhradách - chytá případné zbytky citlivých dat."""
+        has_digit = _DIGIT_RE.search
+        has_assign = _ASSIGN_SEP_RE.search
 
         # LUHN END-SCAN - zachytí všechny Luhn-validní karty (13-19 číslic)
         luhn_pattern = re.compile(r'\b(\d[\s\-]?){12,18}\d\b')
@@ -1956,14 +2253,16 @@ class Anonymizer:
                 # TEST MODE: store_value=True
                 return self._get_or_create_label('CARD', candidate, store_value=True)
             return match.group(0)
-        text = luhn_pattern.sub(final_luhn_card, text)
+        if has_digit(text):
+            text = luhn_pattern.sub(final_luhn_card, text)
 
         # IBAN (pokud unikl) - TEST MODE
         def final_iban(match):
             if not '[[IBAN_' in text[max(0, match.start()-10):match.start()+30]:
                 return self._get_or_create_label('IBAN', match.group(1), store_value=True)
             return match.group(0)
-        text = IBAN_RE.sub(final_iban, text)
+        if has_digit(text):
+            text = IBAN_RE.sub(final_iban, text)
 
         # Platební karty (pokud unikly nebo mají CVV/exp. datum) - TEST MODE
         def final_card(match):
@@ -1971,12 +2270,14 @@ class Anonymizer:
             if card and not '[[CARD_' in text[max(0, match.start()-10):match.start()+len(card)+10]:
                 return self._get_or_create_label('CARD', card, store_value=True)
             return match.group(0)
-        text = CARD_RE.sub(final_card, text)
+        if has_digit(text):
+            text = CARD_RE.sub(final_card, text)
 
         # Hesla (pokud unikla nebo jsou nalepená na jiných entitách) - TEST MODE
         def final_password(match):
             return self._get_or_create_label('PASSWORD', match.group(1), store_value=True)
-        text = PASSWORD_RE.sub(final_password, text)
+        if has_assign(text):
+            text = PASSWORD_RE.sub(final_password, text)
 
         # IP adresy (pokud unikly)
         def final_ip(match):
@@ -1984,26 +2285,31 @@ class Anonymizer:
             if not re.search(r'[a-z]', text[max(0, match.start()-10):match.start()], re.IGNORECASE):
                 return self._get_or_create_label('IP', match.group(1))
             return match.group(0)
-        text = IP_RE.sub(final_ip, text)
+        if has_digit(text):
+            text = IP_RE.sub(final_ip, text)
 
         # Usernames (pokud unikly)
         def final_username(match):
             return self._get_or_create_label('USERNAME', match.group(1))
-        text = USERNAME_RE.sub(final_username, text)
+        if has_assign(text):
+            text = USERNAME_RE.sub(final_username, text)
 
         # API klíče, secrets (pokud unikly) - TEST MODE
         def final_api(match):
             return self._get_or_create_label('API_KEY', match.group(1), store_value=True)
-        text = API_KEY_RE.sub(final_api, text)
+        if has_assign(text):
+            text = API_KEY_RE.sub(final_api, text)
 
         def final_secret(match):
             return self._get_or_create_label('SECRET', match.group(1), store_value=True)
-        text = SECRET_RE.sub(final_secret, text)
+        if has_assign(text):
+            text = SECRET_RE.sub(final_secret, text)
 
         # Pojištěnce (pokud unikla)
         def final_insurance(match):
             return self._get_or_create_label('INSURANCE_ID', match.group(1))
-        text = INSURANCE_ID_RE.sub(final_insurance, text)
+        if has_digit(text):
+            text = INSURANCE_ID_RE.sub(final_insurance, text)
 
         # RFID (pokud uniklo)
         def final_rfid(match):
@@ -2026,7 +2332,8 @@ class Anonymizer:
                 return match.group(0).replace(card, self._get_or_create_label('CARD', card, store_value=True))
             return match.group(0)
 
-        text = card_context_pattern.sub(replace_card_context, text)
+        if has_digit(text):
+            text = card_context_pattern.sub(replace_card_context, text)
 
         # POST-PASS: ALL_CAPS jména bez diakritiky (ALENA DVORAKOVA)
         # Najdi známé osoby a nahraď jejich ALL_CAPS varianty bez diakritiky
@@ -2071,45 +2378,43 @@ class Anonymizer:
             if '[[ADDRESS_' not in text[max(0, match.start()-10):min(len(text), match.end()+10)]:
                 return self._get_or_create_label('ADDRESS', addr)
             return addr
-        text = simple_addr_pattern.sub(replace_simple_addr, text)
+        if has_digit(text):
+            text = simple_addr_pattern.sub(replace_simple_addr, text)
 
         # POST-PASS: Adresy - nahraď všechny výskyty známých adres (i bez PSČ)
         # Projdi všechny adresy v entity_map a nahraď všechny jejich částečné výskyty
-        if 'ADDRESS' in self.entity_map:
-            for addr_key in self.entity_map['ADDRESS'].keys():
-                # Získej tag
-                if addr_key in self.entity_index_cache.get('ADDRESS', {}):
-                    idx = self.entity_index_cache['ADDRESS'][addr_key]
-                    tag = f"[[ADDRESS_{idx}]]"
-
-                    # Generuj varianty: bez PSČ, bez čárek, atd.
-                    # Např. "Karlovo náměstí 12/34, 120 00 Praha 2" → "Karlovo náměstí 12/34, Praha 2"
-                    # Odstran PSČ pattern: \d{3}\s?\d{2}
-                    addr_no_psc = re.sub(r',?\s*\d{3}\s?\d{2}\s*', ', ', addr_key).strip(', ')
-
-                    # Nahraď varianty (ale pouze pokud nejsou už tagované)
-                    for variant in [addr_key, addr_no_psc]:
-                        if variant and len(variant) > 15:  # Min. délka
-                            # Najdi a nahraď všechny výskyty kromě již tagovaných
-                            if variant in text:
-                                # Split by variant
-                                parts = text.split(variant)
-                                if len(parts) > 1:
-                                    # Nahraď pouze pokud kolem není tag
-                                    new_parts = []
-                                    for i, part in enumerate(parts[:-1]):
-                                        new_parts.append(part)
-                                        # Check if not already tagged (look at end of previous part and start of next)
-                                        if not (part.endswith('[[') or parts[i+1].startswith(']]')):
-                                            new_parts.append(tag)
-                                        else:
-                                            new_parts.append(variant)  # Keep original if tagged
-                                    new_parts.append(parts[-1])
-                                    text = ''.join(new_parts)
+        if 'ADDRESS' in self._ents:
+            for idx, addr_key in enumerate(self._ents['ADDRESS']['origs'], 1):
+                tag = f"[[ADDRESS_{idx}]]"
+
+                # Generuj varianty: bez PSČ, bez čárek, atd.
+                # Např. "Karlovo náměstí 12/34, 120 00 Praha 2" → "Karlovo náměstí 12/34, Praha 2"
+                # Odstran PSČ pattern: \d{3}\s?\d{2}
+                addr_no_psc = re.sub(r',?\s*\d{3}\s?\d{2}\s*', ', ', addr_key).strip(', ')
+
+                # Nahraď varianty (ale pouze pokud nejsou už tagované)
+                for variant in [addr_key, addr_no_psc]:
+                    if variant and len(variant) > 15:  # Min. délka
+                        # Najdi a nahraď všechny výskyty kromě již tagovaných
+                        if variant in text:
+                            # Split by variant
+                            parts = text.split(variant)
+                            if len(parts) > 1:
+                                # Nahraď pouze pokud kolem není tag
+                                new_parts = []
+                                for i, part in enumerate(parts[:-1]):
+                                    new_parts.append(part)
+                                    # Check if not already tagged (look at end of previous part and start of next)
+                                    if not (part.endswith('[[') or parts[i+1].startswith(']]')):
+                                        new_parts.append(tag)
+                                    else:
+                                        new_parts.append(variant)  # Keep original if tagged
+                                new_parts.append(parts[-1])
+                                text = ''.join(new_parts)
 
         return text
 
-    def anonymize_docx(self, input_path: str, output_path: str, json_map: str, txt_map: str):
+    def anonymize_docx(self, input_path: str, output_path: str, json_map: str, txt_map: str) -> None:
         """Hlavní metoda pro anonymizaci DOCX dokumentu."""
         print(f"\n🔍 Zpracovávám: {Path(input_path).name}")
 
@@ -2170,7 +2475,7 @@ class Anonymizer:
 
         print(f"✅ Hotovo! Nalezeno {len(self.canonical_persons)} osob")
 
-    def _create_maps(self, json_path: str, txt_path: str, source_file: str, doc=None):
+    def _create_maps(self, json_path: str, txt_path: str, source_file: str, doc=None) -> None:
         """Vytvoří JSON a TXT mapy náhrad."""
 
         # Cleanup nepoužitých tagů před vytvořením map
@@ -2187,6 +2492,7 @@ class Anonymizer:
 
         # SKIP cleanup - not needed in TEST MODE and causes issues with index mapping
         # Všechny entity zůstanou v mapě i když nejsou použity v textu
+        entity_map = self.entity_map  # pohled se skládá jednou pro obě mapy
 
         # JSON mapa
         json_data = {
@@ -2207,7 +2513,7 @@ class Anonymizer:
             })
 
         # Ostatní entity (kromě PERSON, který už je v canonical_persons)
-        for typ, entities in self.entity_map.items():
+        for typ, entities in entity_map.items():
             if typ == 'PERSON':
                 continue  # Skip PERSON - already handled in canonical_persons
             for idx, (original, variants) in enumerate(entities.items(), 1):
@@ -2233,8 +2539,8 @@ class Anonymizer:
                     f.write(f"{p['tag']}: {canonical_full}\n")
 
                     # Vypsat všechny nalezené varianty této osoby
-                    if canonical_full in self.entity_map['PERSON']:
-                        variants = self.entity_map['PERSON'][canonical_full]
+                    if canonical_full in entity_map['PERSON']:
+                        variants = entity_map['PERSON'][canonical_full]
                         # Vypsat pouze varianty odlišné od kanonického tvaru
                         for variant in sorted(variants):
                             if variant.lower() != canonical_full.lower():
@@ -2242,7 +2548,7 @@ class Anonymizer:
                 f.write("\n")
 
             # Ostatní entity (kromě PERSON, který už je v OSOBY)
-            for typ, entities in sorted(self.entity_map.items()):
+            for typ, entities in sorted(entity_map.items()):
                 if typ == 'PERSON':
                     continue  # Skip PERSON - already handled in OSOBY section
                 if entities:
@@ -2255,8 +2561,36 @@ class Anonymizer:
                     f.write("\n")
 
 # =============== Batch processing ===============
-def batch_anonymize(folder_path, names_json="cz_names.v1.json"):
-    """Zpracuje všechny DOCX soubory v adresáři."""
+def _anonymize_batch_file(path: Path) -> None:
+    """Anonymizuje jeden soubor dávky (výstupy vedle vstupu)."""
+    print(f"\n{'='*60}")
+    base = path.stem
+    out_docx = path.parent / f"{base}_anon.docx"
+    out_json = path.parent / f"{base}_map.json"
+    out_txt = path.parent / f"{base}_map.txt"
+
+    try:
+        a = Anonymizer(verbose=False)
+        a.anonymize_docx(str(path), str(out_docx), str(out_json), str(out_txt))
+        print(f"✅ Výstupy: {out_docx.name}, {out_json.name}, {out_txt.name}")
+    except Exception as e:
+        print(f"❌ CHYBA při zpracování {path.name}: {e}")
+        import traceback
+        traceback.print_exc()
+
+def _init_batch_worker(names_json: str) -> None:
+    """Inicializace procesu dávky – každý proces si načte knihovnu jmen."""
+    global CZECH_FIRST_NAMES
+    CZECH_FIRST_NAMES = load_names_library(names_json)
+    infer_first_name_nominative.cache_clear()
+
+def batch_anonymize(folder_path, names_json="cz_names.v1.json", jobs: int = 1):
+    """Zpracuje všechny DOCX soubory v adresáři.
+
+    jobs > 1 zpracuje dokumenty paralelně v samostatných procesech. Dokumenty
+    jsou na sobě nezávislé (každý má vlastní Anonymizer, štítky i mapy),
+    výstupy jsou proto stejné jako při sekvenčním běhu.
+    """
     folder = Path(folder_path)
     docx_files = sorted([f for f in folder.glob("*.docx") if not f.name.startswith('~') and '_anon' not in f.name])
 
@@ -2266,24 +2600,20 @@ def batch_anonymize(folder_path, names_json="cz_names.v1.json"):
 
     print(f"\n📁 Zpracovávám {len(docx_files)} souborů v adresáři {folder_path}\n")
 
-    global CZECH_FIRST_NAMES
-    CZECH_FIRST_NAMES = load_names_library(names_json)
+    if jobs > 1 and len(docx_files) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(jobs, len(docx_files)),
+                                 initializer=_init_batch_worker, initargs=(names_json,)) as pool:
+            list(pool.map(_anonymize_batch_file, docx_files))
+        return
 
-    for path in docx_files:
-        print(f"\n{'='*60}")
-        base = path.stem
-        out_docx = path.parent / f"{base}_anon.docx"
-        out_json = path.parent / f"{base}_map.json"
-        out_txt = path.parent / f"{base}_map.txt"
+    _init_batch_worker(names_json)
 
-        try:
-            a = Anonymizer(verbose=False)
-            a.anonymize_docx(str(path), str(out_docx), str(out_json), str(out_txt))
-            print(f"✅ Výstupy: {out_docx.name}, {out_json.name}, {out_txt.name}")
-        except Exception as e:
-            print(f"❌ CHYBA při zpracování {path.name}: {e}")
-            import traceback
-            traceback.print_exc()
+    # Knihovna jmen a všechny předkompilované vzory (PII regexy, vzory osob,
+    # cache nominativů) jsou na úrovni modulu – sdílí se napříč celou dávkou,
+    # pro každý dokument vzniká jen nový Anonymizer se stavem entit
+    for path in docx_files:
+        _anonymize_batch_file(path)
 
 # =============== Main ===============
 def main():
@@ -2292,21 +2622,24 @@ def main():
     ap.add_argument("docx_path", nargs='?', help="Cesta k .docx souboru nebo adresáři")
     ap.add_argument("--names-json", default="cz_names.v1.json", help="Cesta k JSON knihovně jmen")
     ap.add_argument("--batch", action="store_true", help="Zpracovat všechny .docx v adresáři")
+    ap.add_argument("--jobs", type=int, default=1, help="Počet paralelních procesů pro --batch (výchozí 1)")
     args = ap.parse_args()
 
     try:
-        global CZECH_FIRST_NAMES
-        CZECH_FIRST_NAMES = load_names_library(args.names_json)
-
+        # Batch mode si knihovnu jmen načte sám (jednou pro celou dávku)
         if args.batch and args.docx_path:
-            batch_anonymize(args.docx_path, args.names_json)
+            batch_anonymize(args.docx_path, args.names_json, args.jobs)
             return 0
 
         if args.batch and not args.docx_path:
             # Batch mode v aktuálním adresáři
-            batch_anonymize(".", args.names_json)
+            batch_anonymize(".", args.names_json, args.jobs)
             return 0
 
+        global CZECH_FIRST_NAMES
+        CZECH_FIRST_NAMES = load_names_library(args.names_json)
+        infer_first_name_nominative.cache_clear()
+
         # Single file mode
         if not args.docx_path:
             print("❌ Chybí cesta k souboru. Použij: python script.py <soubor.docx>")